@@ -7,13 +7,16 @@ class Minesweeper():
     Minesweeper game representation
     """
 
-    def __init__(self, height=8, width=8, mines=8):
+    def __init__(self, height=8, width=8, mines=8, rng=None):
 
         # Set initial width, height, and number of mines
         self.height = height
         self.width = width
         self.mines = set()
 
+        # Draw from `rng`, a random.Random or NumPy Generator, if given
+        rng = random if rng is None else rng
+
         # Initialize an empty field with no mines
         self.board = []
         for i in range(self.height):
@@ -22,10 +25,15 @@ class Minesweeper():
                 row.append(False)
             self.board.append(row)
 
-        # Add mines randomly
+        # Add mines randomly, in a single draw from a NumPy Generator
+        if hasattr(rng, "integers"):
+            for cell in rng.choice(height * width, size=mines, replace=False).tolist():
+                i, j = divmod(cell, width)
+                self.mines.add((i, j))
+                self.board[i][j] = True
         while len(self.mines) != mines:
-            i = random.randrange(height)
-            j = random.randrange(width)
+            i = rng.randrange(height)
+            j = rng.randrange(width)
             if not self.board[i][j]:
                 self.mines.add((i, j))
                 self.board[i][j] = True
@@ -148,12 +156,15 @@ class MinesweeperAI():
     Minesweeper game player
     """
 
-    def __init__(self, height=8, width=8):
+    def __init__(self, height=8, width=8, rng=None):
 
         # Set initial height and width
         self.height = height
         self.width = width
 
+        # Draw random moves from `rng`, a random.Random or NumPy Generator
+        self.rng = random if rng is None else rng
+
         # Keep track of which cells have been clicked on
         self.moves_made = set()
 
@@ -280,7 +291,10 @@ class MinesweeperAI():
                     movesToMake.add((i,j)) 
         
         if len(movesToMake) > 0:
-            return random.choice(list(movesToMake))
+            moves = list(movesToMake)
+            if hasattr(self.rng, "integers"):
+                return moves[int(self.rng.integers(len(moves)))]
+            return self.rng.choice(moves)
         else:
             return None
 
@@ -1,6 +1,5 @@
 import pygame
 import sys
-import time
 
 from minesweeper import Minesweeper, MinesweeperAI
 
@@ -37,6 +36,131 @@ flag = pygame.transform.scale(flag, (cell_size, cell_size))
 mine = pygame.image.load("assets/images/mine.png")
 mine = pygame.transform.scale(mine, (cell_size, cell_size))
 
+# Screen areas, redrawn only when what they show changes
+buttonRect = pygame.Rect((width / 4), (3 / 4) * height, width / 2, 50)
+aiButton = pygame.Rect(
+    (2 / 3) * width + BOARD_PADDING, (1 / 3) * height - 50,
+    (width / 3) - BOARD_PADDING * 2, 50
+)
+resetButton = pygame.Rect(
+    (2 / 3) * width + BOARD_PADDING, (1 / 3) * height + 20,
+    (width / 3) - BOARD_PADDING * 2, 50
+)
+textArea = pygame.Rect((2 / 3) * width, (2 / 3) * height - 25, width / 3, 50)
+cells = [
+    [
+        pygame.Rect(
+            board_origin[0] + j * cell_size,
+            board_origin[1] + i * cell_size,
+            cell_size, cell_size
+        )
+        for j in range(WIDTH)
+    ]
+    for i in range(HEIGHT)
+]
+
+# Unrevealed cell, drawn once and copied to the screen as needed
+blank = pygame.Surface((cell_size, cell_size))
+blank.fill(GRAY)
+pygame.draw.rect(blank, WHITE, blank.get_rect(), 3)
+
+# Rendered text, by font, text and color
+glyphs = {}
+
+
+def render(font, text, color):
+    """
+    Returns the surface for `text`, rendering it only the first time.
+    """
+    key = (font, text, color)
+    if key not in glyphs:
+        glyphs[key] = font.render(text, True, color)
+    return glyphs[key]
+
+
+def draw_text(font, text, color, center):
+    """
+    Draws `text` centered on `center` and returns the rect it covers.
+    """
+    surface = render(font, text, color)
+    rect = surface.get_rect()
+    rect.center = center
+    screen.blit(surface, rect)
+    return rect
+
+
+def draw_button(rect, label):
+    """
+    Draws a button and returns its rect.
+    """
+    pygame.draw.rect(screen, WHITE, rect)
+    draw_text(mediumFont, label, BLACK, rect.center)
+    return rect
+
+
+def draw_instructions():
+    """
+    Draws the instructions screen.
+    """
+    screen.fill(BLACK)
+
+    # Title
+    draw_text(largeFont, "Play Minesweeper", WHITE, ((width / 2), 50))
+
+    # Rules
+    rules = [
+        "Click a cell to reveal it.",
+        "Right-click a cell to mark it as a mine.",
+        "Mark all mines successfully to win!"
+    ]
+    for i, rule in enumerate(rules):
+        draw_text(smallFont, rule, WHITE, ((width / 2), 150 + 30 * i))
+
+    # Play game button
+    draw_button(buttonRect, "Play Game")
+
+
+def draw_cell(cell):
+    """
+    Draws `cell` with a mine, flag, or number if needed, and returns
+    its rect.
+    """
+    i, j = cell
+    rect = cells[i][j]
+    screen.blit(blank, rect)
+    if game.is_mine(cell) and lost:
+        screen.blit(mine, rect)
+    elif cell in flags:
+        screen.blit(flag, rect)
+    elif cell in revealed:
+        draw_text(smallFont, str(game.nearby_mines(cell)), BLACK, rect.center)
+    return rect
+
+
+def draw_result():
+    """
+    Draws the win or loss text and returns its area.
+    """
+    screen.fill(BLACK, textArea)
+    text = "Lost" if lost else "Won" if game.mines == flags else ""
+    if text:
+        draw_text(mediumFont, text, WHITE, ((5 / 6) * width, (2 / 3) * height))
+    return textArea
+
+
+def draw_game():
+    """
+    Draws the whole game screen.
+    """
+    screen.fill(BLACK)
+    for i in range(HEIGHT):
+        for j in range(WIDTH):
+            draw_cell((i, j))
+    draw_button(aiButton, "AI Move")
+    draw_button(resetButton, "Reset")
+    draw_result()
+
+
 # Create game and AI agent
 game = Minesweeper(height=HEIGHT, width=WIDTH, mines=MINES)
 ai = MinesweeperAI(height=HEIGHT, width=WIDTH)
@@ -48,135 +172,51 @@ lost = False
 
 # Show instructions initially
 instructions = True
+draw_instructions()
+pygame.display.flip()
 
 while True:
 
+    # Sleep until something happens
+    event = pygame.event.wait()
+    updates = []
+
     # Check if game quit
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
+    if event.type == pygame.QUIT:
+        sys.exit()
 
-    screen.fill(BLACK)
+    elif event.type == pygame.VIDEOEXPOSE:
+        if instructions:
+            draw_instructions()
+        else:
+            draw_game()
+        updates.append(screen.get_rect())
 
-    # Show game instructions
-    if instructions:
-
-        # Title
-        title = largeFont.render("Play Minesweeper", True, WHITE)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 50)
-        screen.blit(title, titleRect)
-
-        # Rules
-        rules = [
-            "Click a cell to reveal it.",
-            "Right-click a cell to mark it as a mine.",
-            "Mark all mines successfully to win!"
-        ]
-        for i, rule in enumerate(rules):
-            line = smallFont.render(rule, True, WHITE)
-            lineRect = line.get_rect()
-            lineRect.center = ((width / 2), 150 + 30 * i)
-            screen.blit(line, lineRect)
-
-        # Play game button
-        buttonRect = pygame.Rect((width / 4), (3 / 4) * height, width / 2, 50)
-        buttonText = mediumFont.render("Play Game", True, BLACK)
-        buttonTextRect = buttonText.get_rect()
-        buttonTextRect.center = buttonRect.center
-        pygame.draw.rect(screen, WHITE, buttonRect)
-        screen.blit(buttonText, buttonTextRect)
-
-        # Check if play button clicked
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1:
-            mouse = pygame.mouse.get_pos()
-            if buttonRect.collidepoint(mouse):
-                instructions = False
-                time.sleep(0.3)
-
-        pygame.display.flip()
+    elif event.type != pygame.MOUSEBUTTONDOWN:
         continue
 
-    # Draw board
-    cells = []
-    for i in range(HEIGHT):
-        row = []
-        for j in range(WIDTH):
-
-            # Draw rectangle for cell
-            rect = pygame.Rect(
-                board_origin[0] + j * cell_size,
-                board_origin[1] + i * cell_size,
-                cell_size, cell_size
-            )
-            pygame.draw.rect(screen, GRAY, rect)
-            pygame.draw.rect(screen, WHITE, rect, 3)
-
-            # Add a mine, flag, or number if needed
-            if game.is_mine((i, j)) and lost:
-                screen.blit(mine, rect)
-            elif (i, j) in flags:
-                screen.blit(flag, rect)
-            elif (i, j) in revealed:
-                neighbors = smallFont.render(
-                    str(game.nearby_mines((i, j))),
-                    True, BLACK
-                )
-                neighborsTextRect = neighbors.get_rect()
-                neighborsTextRect.center = rect.center
-                screen.blit(neighbors, neighborsTextRect)
-
-            row.append(rect)
-        cells.append(row)
-
-    # AI Move button
-    aiButton = pygame.Rect(
-        (2 / 3) * width + BOARD_PADDING, (1 / 3) * height - 50,
-        (width / 3) - BOARD_PADDING * 2, 50
-    )
-    buttonText = mediumFont.render("AI Move", True, BLACK)
-    buttonRect = buttonText.get_rect()
-    buttonRect.center = aiButton.center
-    pygame.draw.rect(screen, WHITE, aiButton)
-    screen.blit(buttonText, buttonRect)
-
-    # Reset button
-    resetButton = pygame.Rect(
-        (2 / 3) * width + BOARD_PADDING, (1 / 3) * height + 20,
-        (width / 3) - BOARD_PADDING * 2, 50
-    )
-    buttonText = mediumFont.render("Reset", True, BLACK)
-    buttonRect = buttonText.get_rect()
-    buttonRect.center = resetButton.center
-    pygame.draw.rect(screen, WHITE, resetButton)
-    screen.blit(buttonText, buttonRect)
-
-    # Display text
-    text = "Lost" if lost else "Won" if game.mines == flags else ""
-    text = mediumFont.render(text, True, WHITE)
-    textRect = text.get_rect()
-    textRect.center = ((5 / 6) * width, (2 / 3) * height)
-    screen.blit(text, textRect)
-
-    move = None
-
-    left, _, right = pygame.mouse.get_pressed()
+    # Check if play button clicked
+    elif instructions:
+        if event.button == 1 and buttonRect.collidepoint(event.pos):
+            instructions = False
+            draw_game()
+            updates.append(screen.get_rect())
 
     # Check for a right-click to toggle flagging
-    if right == 1 and not lost:
-        mouse = pygame.mouse.get_pos()
+    elif event.button == 3 and not lost:
         for i in range(HEIGHT):
             for j in range(WIDTH):
-                if cells[i][j].collidepoint(mouse) and (i, j) not in revealed:
+                if cells[i][j].collidepoint(event.pos) and (i, j) not in revealed:
                     if (i, j) in flags:
                         flags.remove((i, j))
                     else:
                         flags.add((i, j))
-                    time.sleep(0.2)
+                    updates.append(draw_cell((i, j)))
+                    updates.append(draw_result())
 
-    elif left == 1:
-        mouse = pygame.mouse.get_pos()
+    elif event.button == 1:
+        mouse = event.pos
+        move = None
 
         # If AI button clicked, make an AI move
         if aiButton.collidepoint(mouse) and not lost:
@@ -186,11 +226,12 @@ while True:
                 if move is None:
                     flags = ai.mines.copy()
                     print("No moves left to make.")
+                    draw_game()
+                    updates.append(screen.get_rect())
                 else:
                     print("No known safe moves, AI making random move.")
             else:
                 print("AI making safe move.")
-            time.sleep(0.2)
 
         # Reset game state
         elif resetButton.collidepoint(mouse):
@@ -199,7 +240,8 @@ while True:
             revealed = set()
             flags = set()
             lost = False
-            continue
+            draw_game()
+            updates.append(screen.get_rect())
 
         # User-made move
         elif not lost:
@@ -210,13 +252,20 @@ while True:
                             and (i, j) not in revealed):
                         move = (i, j)
 
-    # Make move and update AI knowledge
-    if move:
-        if game.is_mine(move):
-            lost = True
-        else:
-            nearby = game.nearby_mines(move)
-            revealed.add(move)
-            ai.add_knowledge(move, nearby)
+        # Make move and update AI knowledge
+        if move:
+            if game.is_mine(move):
+                lost = True
+
+                # Show every mine
+                for cell in game.mines:
+                    updates.append(draw_cell(cell))
+                updates.append(draw_result())
+            else:
+                nearby = game.nearby_mines(move)
+                revealed.add(move)
+                ai.add_knowledge(move, nearby)
+                updates.append(draw_cell(move))
 
-    pygame.display.flip()
+    if updates:
+        pygame.display.update(updates)
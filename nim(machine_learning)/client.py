@@ -0,0 +1,108 @@
+"""
+Load test for the Nim game server
+
+Opens many sessions at once, each playing random legal moves against
+the server, and reports games played, the AI's results and reply
+latencies.
+
+Usage: python client.py [--host H] [--port P] [--sessions N] [--games G]
+                        [--seed S]
+"""
+
+import argparse
+import asyncio
+import random
+import time
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """
+    Returns the nearest-rank percentiles of `values`, in milliseconds.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": None for point in points}
+    result = {}
+    for point in points:
+        rank = max(1, round(point / 100 * len(ordered)))
+        result[f"p{point}"] = 1000 * ordered[min(rank, len(ordered)) - 1]
+    return result
+
+
+async def request(reader, writer, line):
+    """
+    Sends one command and returns the reply lines, up to and including
+    the one that ends the reply.
+    """
+    writer.write((line + "\n").encode())
+    await writer.drain()
+    reply = []
+    while True:
+        answer = (await reader.readline()).decode().strip()
+        if not answer:
+            raise ConnectionError("server closed the connection")
+        reply.append(answer)
+        if answer.split()[0] in ("PILES", "WIN", "LOSE", "BYE", "ERROR"):
+            return reply
+
+
+async def play_session(host, port, games, rng, latencies):
+    """
+    Plays `games` games of random moves in one session and returns how
+    many the client won.
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    wins = 0
+    try:
+        for n in range(games):
+            line = f"NEW {rng.choice(['first', 'second'])}"
+            while True:
+                start = time.perf_counter()
+                reply = await request(reader, writer, line)
+                latencies.append(time.perf_counter() - start)
+                last = reply[-1].split()
+                if last[0] == "ERROR":
+                    raise RuntimeError(reply[-1])
+                if last[0] in ("WIN", "LOSE"):
+                    wins += last[0] == "WIN"
+                    break
+                piles = [int(pile) for pile in last[1:]]
+                pile = rng.choice([i for i, size in enumerate(piles) if size])
+                line = f"MOVE {pile} {rng.randint(1, piles[pile])}"
+        await request(reader, writer, "QUIT")
+    finally:
+        writer.close()
+    return wins
+
+
+async def load_test(host, port, sessions, games, seed):
+    """
+    Runs `sessions` sessions of `games` games each at once and prints
+    the results.
+    """
+    latencies = []
+    start = time.perf_counter()
+    wins = await asyncio.gather(*(
+        play_session(host, port, games, random.Random(seed + n), latencies)
+        for n in range(sessions)
+    ))
+    elapsed = time.perf_counter() - start
+
+    played = sessions * games
+    print(f"{sessions} sessions, {played} games in {elapsed:.2f}s "
+          f"({played / elapsed:.0f} games/s, {len(latencies) / elapsed:.0f} replies/s)")
+    print(f"Clients won {sum(wins)} of {played} games")
+    print("Reply latency: " + ", ".join(
+        f"{name} {value:.2f} ms" for name, value in percentiles(latencies).items()
+    ))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test the Nim game server.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--games", type=int, default=5)
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+    asyncio.run(load_test(args.host, args.port, args.sessions, args.games, args.seed))
@@ -1,6 +1,15 @@
+import functools
+import json
 import math
+import mmap
+import os
 import random
+import struct
+import sys
 import time
+from array import array
+
+import solver
 
 
 class Nim():
@@ -25,12 +34,22 @@ class Nim():
 
         Action `(i, j)` represents the action of removing `j` items
         from pile `i` (where piles are 0-indexed).
+
+        The actions come back as a tuple sorted by `(i, j)`, built once
+        per state and shared between calls, so it must not be changed.
+        """
+        return _available_actions(tuple(piles))
+
+    @classmethod
+    def actions(cls, piles):
+        """
+        Nim.actions(piles) yields the available actions `(i, j)` in
+        `piles` one at a time, in the order of Nim.available_actions,
+        without building or caching them, for piles too large to list.
         """
-        actions = set()
         for i, pile in enumerate(piles):
             for j in range(1, pile + 1):
-                actions.add((i, j))
-        return actions
+                yield (i, j)
 
     @classmethod
     def other_player(cls, player):
@@ -70,9 +89,34 @@ class Nim():
             self.winner = self.player
 
 
+@functools.lru_cache(maxsize=1 << 16)
+def _available_actions(piles):
+    """
+    Nim.available_actions for a tuple of piles, memoized per state.
+    """
+    return tuple(
+        (i, j) for i, pile in enumerate(piles) for j in range(1, pile + 1)
+    )
+
+
+def as_rng(rng):
+    """
+    Returns `rng` as a source of random choices for an AI: the `random`
+    module if None, a NumPy Generator wrapped in a streams.BlockRandom,
+    or else `rng` itself, such as a `random.Random`.
+    """
+    if rng is None:
+        return random
+    if hasattr(rng, "integers"):
+        # Imported here so the AIs only need NumPy when given a Generator
+        from streams import BlockRandom
+        return BlockRandom(rng)
+    return rng
+
+
 class NimAI():
 
-    def __init__(self, alpha=0.5, epsilon=0.1):
+    def __init__(self, alpha=0.5, epsilon=0.1, rng=None):
         """
         Initialize AI with an empty Q-learning dictionary,
         an alpha (learning) rate, and an epsilon rate.
@@ -81,10 +125,15 @@ class NimAI():
         pairs to a Q-value (a number).
          - `state` is a tuple of remaining piles, e.g. (1, 1, 4, 4)
          - `action` is a tuple `(i, j)` for an action
+
+        Random choices are drawn from `rng`, such as a `random.Random`,
+        a streams.BlockRandom or a NumPy Generator, or from the `random`
+        module if None.
         """
         self.q = dict()
         self.alpha = alpha
         self.epsilon = epsilon
+        self.rng = as_rng(rng)
 
     def update(self, old_state, action, new_state, reward):
         """
@@ -141,16 +190,8 @@ class NimAI():
         `state`, return 0.
         """
         # print("best_future_reward called")
-        availableActions = Nim.available_actions(state)
-        if len(availableActions) == 0:
-            return 0
-        else:
-            maxReward = float('-inf') 
-            for action in availableActions:
-                if self.get_q_value(state, action) > maxReward:
-                    maxReward = self.get_q_value(state, action)
-            return maxReward
-        
+        key = tuple(state)
+        return max((self.q.get((key, action), 0) for action in Nim.actions(state)), default=0)
 
 
     def choose_action(self, state, epsilon=True):
@@ -171,82 +212,618 @@ class NimAI():
 
         # print("choose_action called")
 
+        if epsilon and self.rng.random() <= self.epsilon:
+            return self.random_action(state)
 
-        availableActions = Nim.available_actions(state)
-        bestReward = self.best_future_reward(state)
+        # Find the best action in one pass over the actions
+        key = tuple(state)
+        bestAction = None
+        bestReward = float('-inf')
+        for action in Nim.actions(state):
+            reward = self.q.get((key, action), 0)
+            if reward > bestReward:
+                bestAction, bestReward = action, reward
+        return bestAction
+
+    def random_action(self, state):
+        """
+        Return an action `(i, j)` available in `state`, each equally
+        likely, drawn by counting off objects rather than listing the
+        actions, so it is cheap however large the piles.
+        """
+        n = self.rng.randrange(sum(state))
+        for i, pile in enumerate(state):
+            if n < pile:
+                return (i, n + 1)
+            n -= pile
+
+
+
+
+
+class StateSpace():
+
+    def __init__(self, initial=[1, 3, 5, 7]):
+        """
+        Index the states and actions of games starting from `initial`.
+
+        A state is numbered as a mixed-radix number whose digits are the
+        pile sizes, pile 0 being the lowest digit, so there are
+        prod(pile + 1) states. Action `(i, j)` is numbered
+        `offsets[i] + j - 1`, so there are sum(initial) actions.
+        """
+        self.initial = list(initial)
+        self.strides = []
+        stride = 1
+        for pile in self.initial:
+            self.strides.append(stride)
+            stride *= pile + 1
+        self.size = stride
+        self.actions = [
+            (i, j) for i, pile in enumerate(self.initial) for j in range(1, pile + 1)
+        ]
+        self.action_index = {action: n for n, action in enumerate(self.actions)}
+
+        # How much each action lowers the state number
+        self.deltas = [j * self.strides[i] for i, j in self.actions]
+
+        # Legal action numbers of each state, filled in on first use
+        self.legal = [None] * self.size
+
+    def index(self, piles):
+        """
+        Returns the number of the state with piles `piles`.
+        """
+        index = 0
+        for pile, stride in zip(piles, self.strides):
+            index += pile * stride
+        return index
+
+    def piles(self, index):
+        """
+        Returns the piles of state number `index`.
+        """
+        return [index // stride % (pile + 1) for pile, stride in zip(self.initial, self.strides)]
+
+    def legal_actions(self, index):
+        """
+        Returns the numbers of the actions available in state `index`.
+        """
+        legal = self.legal[index]
+        if legal is None:
+            piles = self.piles(index)
+            legal = tuple(
+                n for n, (i, j) in enumerate(self.actions) if j <= piles[i]
+            )
+            self.legal[index] = legal
+        return legal
 
-        if epsilon == False:
-            for action in availableActions:
-                if self.get_q_value(state, action) == bestReward:
-                    return action
+
+# Default snapshot file, and the bytes every snapshot starts with
+SNAPSHOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "nim_ai.bin")
+MAGIC = b"NIMQ"
+
+
+class DenseNimAI(NimAI):
+
+    def __init__(self, alpha=0.5, epsilon=0.1, initial=[1, 3, 5, 7], rng=None, q=None):
+        """
+        Initialize AI with a Q-table stored as a flat array of doubles,
+        with one slot for every (state, action) pair of games starting
+        from piles `initial`, in the order given by a StateSpace.
+        Slots for illegal actions stay 0 and are never read.
+
+        The table starts at all zeros, or is `q` if given: any sequence
+        of doubles of the right length, used as it is.
+        """
+        super().__init__(alpha=alpha, epsilon=epsilon, rng=rng)
+        self.space = StateSpace(initial)
+        self.width = len(self.space.actions)
+        slots = self.space.size * self.width
+        if q is None:
+            q = array("d", bytes(8 * slots))
+        elif len(q) != slots:
+            raise ValueError(f"Q-table has {len(q)} slots, not {slots}, for piles {self.space.initial}")
+        self.q = q
+
+    def get_q_value(self, state, action):
+        """
+        Return the Q-value for the state `state` and the action `action`.
+        """
+        space = self.space
+        return self.q[space.index(state) * self.width + space.action_index[action]]
+
+    def update_q_value(self, state, action, old_q, reward, future_rewards):
+        """
+        Update the Q-value for the state `state` and the action `action`,
+        as NimAI.update_q_value does.
+        """
+        space = self.space
+        slot = space.index(state) * self.width + space.action_index[action]
+        self.q[slot] = old_q + self.alpha * ((reward + future_rewards) - old_q)
+
+    def best_future_reward(self, state):
+        """
+        Return the highest Q-value among the actions available in
+        `state`, or 0 if there are none.
+        """
+        return self.best_value(self.space.index(state))
+
+    def choose_action(self, state, epsilon=True):
+        """
+        Given a state `state`, return an action `(i, j)` to take, as
+        NimAI.choose_action does, in a single pass over the actions.
+        """
+        return self.space.actions[self.choose(self.space.index(state), epsilon)]
+
+    def best_value(self, index):
+        """
+        Return the highest Q-value among the actions available in state
+        number `index`, or 0 if there are none.
+        """
+        legal = self.space.legal_actions(index)
+        if not legal:
+            return 0
+        base = index * self.width
+        q = self.q
+        best_q = q[base + legal[0]]
+        for n in legal:
+            if q[base + n] > best_q:
+                best_q = q[base + n]
+        return best_q
+
+    def choose(self, index, epsilon=True):
+        """
+        Return the number of the action to take in state number
+        `index`, chosen as choose_action chooses.
+        """
+        legal = self.space.legal_actions(index)
+        if epsilon and self.rng.random() <= self.epsilon:
+            return self.rng.choice(legal)
+
+        base = index * self.width
+        q = self.q
+        best = legal[0]
+        best_q = q[base + best]
+        for n in legal:
+            if q[base + n] > best_q:
+                best, best_q = n, q[base + n]
+        return best
+
+    def learn(self, index, action, new_index, reward):
+        """
+        Update the Q-value of action number `action` in state number
+        `index`, as update does, given the resulting state number.
+        """
+        slot = index * self.width + action
+        old_q = self.q[slot]
+        self.q[slot] = old_q + self.alpha * ((reward + self.best_value(new_index)) - old_q)
+
+    def save(self, path=SNAPSHOT):
+        """
+        Write the AI to `path`: a header with the piles, alpha and
+        epsilon, then the Q-table as raw doubles.
+        """
+        piles = self.space.initial
+        header = struct.pack(f"<4sIdd{len(piles)}I", MAGIC, len(piles), self.alpha, self.epsilon, *piles)
+        with open(path, "wb") as f:
+            f.write(header + bytes(-len(header) % 8))
+            f.write(self.q)
+
+    @classmethod
+    def load(cls, path=SNAPSHOT):
+        """
+        Return the AI saved at `path`. The Q-table is memory-mapped
+        rather than read or allocated, so pages are only loaded as they
+        are used; training the loaded AI changes only the copy in
+        memory, never the file.
+        """
+        with open(path, "rb") as f:
+            snapshot = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_COPY)
+        magic, count, alpha, epsilon = struct.unpack_from("<4sIdd", snapshot)
+        if magic != MAGIC:
+            snapshot.close()
+            raise ValueError(f"{path} is not a Nim AI snapshot")
+        piles = list(struct.unpack_from(f"<{count}I", snapshot, struct.calcsize("<4sIdd")))
+        offset = struct.calcsize(f"<4sIdd{count}I")
+        offset += -offset % 8
+
+        space = StateSpace(piles)
+        if len(snapshot) - offset != space.size * len(space.actions) * 8:
+            snapshot.close()
+            raise ValueError(f"{path} does not hold a Q-table for piles {piles}")
+        q = memoryview(snapshot)[offset:].cast("d")
+        return cls(alpha=alpha, epsilon=epsilon, initial=piles, q=q)
+
+
+class LinearNimAI(NimAI):
+
+    def __init__(self, alpha=0.1, epsilon=0.1, bits=16, gamma=0.9, rng=None):
+        """
+        Initialize AI whose Q-values are a linear function of features
+        of the piles each action leaves behind, so memory stays fixed
+        and choosing a move costs time linear in the number of piles,
+        whatever their size.
+
+        `q` holds one weight per feature:
+         - `bits` weights, one for each bit of the nim-sum of the piles
+           left, and one more for a nim-sum of 0, used while some pile
+           has more than one object
+         - two weights for an odd or even number of single objects left,
+           used once no pile has more than one
+         - a bias
+        Pile sizes must be below 2 ** `bits`.
+
+        Future rewards are discounted by `gamma`: long games bootstrap
+        mostly from their own estimates, and undiscounted, weights that
+        no reward ever corrects can drift up and take over the policy.
+        """
+        super().__init__(alpha=alpha, epsilon=epsilon, rng=rng)
+        self.bits = bits
+        self.gamma = gamma
+        self.q = array("d", bytes(8 * (bits + 4)))
+
+    def summary(self, state):
+        """
+        Return the nim-sum of `state`, its number of piles with more
+        than one object, and its number of piles with exactly one.
+        """
+        total = big = ones = 0
+        for pile in state:
+            total ^= pile
+            if pile > 1:
+                big += 1
+            elif pile == 1:
+                ones += 1
+        return total, big, ones
+
+    def features(self, total, big, ones):
+        """
+        Return the numbers of the features that are on for piles with
+        nim-sum `total`, `big` piles above one and `ones` single objects.
+        """
+        if not big:
+            active = [self.bits + 1 + ones % 2]
+        elif total:
+            active = [b for b in range(self.bits) if total >> b & 1]
         else:
-            randomRate = random.random()
-            if  randomRate <= self.epsilon:
-                    return random.choice(list(availableActions))
+            active = [self.bits]
+        active.append(self.bits + 3)
+        return active
 
-            else:
-                for action in availableActions:
-                    if self.get_q_value(state, action) == bestReward:
-                        return action
+    def value(self, total, big, ones):
+        """
+        Return the weighted sum of the features that are on, without
+        building the list.
+        """
+        q = self.q
+        value = q[-1]
+        if not big:
+            return value + q[self.bits + 1 + ones % 2]
+        if not total:
+            return value + q[self.bits]
+        while total:
+            low = total & -total
+            value += q[low.bit_length() - 1]
+            total ^= low
+        return value
+
+    def after(self, summary, pile, count):
+        """
+        Return the summary of the piles left after taking `count` from a
+        pile of size `pile`, given the `summary` of the piles before.
+        """
+        total, big, ones = summary
+        left = pile - count
+        return (
+            total ^ pile ^ left,
+            big - (pile > 1) + (left > 1),
+            ones - (pile == 1) + (left == 1)
+        )
+
+    def get_q_value(self, state, action):
+        """
+        Return the Q-value for the state `state` and the action `action`.
+        """
+        i, j = action
+        return self.value(*self.after(self.summary(state), state[i], j))
 
+    def update_q_value(self, state, action, old_q, reward, future_rewards):
+        """
+        Move the Q-value for `state` and `action` towards
+        `reward + gamma * future_rewards` by a gradient step on the
+        weights of the features that are on, shared out between them.
+        """
+        i, j = action
+        active = self.features(*self.after(self.summary(state), state[i], j))
+        step = self.alpha * ((reward + self.gamma * future_rewards) - old_q) / len(active)
+        q = self.q
+        for n in active:
+            q[n] += step
+
+    def best_left(self, rest, low, high, positive):
+        """
+        Return the highest value of leaving `left` objects in a pile,
+        for `low` <= `left` < `high`, where the other piles have nim-sum
+        `rest` and some pile keeps more than one object; and a `left`
+        that has it. `positive` has a 1 for each bit whose weight
+        is positive.
+
+        The range is split into aligned blocks whose low bits are free,
+        and in each block those bits are set so the nim-sum has exactly
+        the positive-weight bits, so the cost depends on the number of
+        bits, not on the size of the pile. Leaving a nim-sum of 0 is
+        tried on its own.
+        """
+        best, best_q = None, None
+        if low <= rest < high:
+            best, best_q = rest, self.value(0, 1, 0)
+        start = low
+        while start < high:
+            size = start & -start if start else 1 << (high.bit_length() - 1)
+            while start + size > high:
+                size >>= 1
+            free = size - 1
+            total = (rest ^ start) & ~free | positive & free
+            if not total and free:
+                # A nim-sum of 0 was tried already: set the cheapest bit
+                total = 1 << max(range(free.bit_length()), key=self.q.__getitem__)
+            if total:
+                left = start | (total ^ rest) & free
+                q = self.value(total, 1, 0)
+                if best is None or q > best_q:
+                    best, best_q = left, q
+            start += size
+        return best_q, best
+
+    def best_action(self, state):
+        """
+        Return the highest Q-value among the actions available in
+        `state` and an action that has it, or (0, None) if there are no
+        actions. Takes time linear in the number of piles.
+        """
+        total, big, ones = self.summary(state)
+        q = self.q
+        positive = sum(1 << b for b in range(self.bits) if q[b] > 0)
+        best, best_q = None, 0
+        for i, pile in enumerate(state):
+            if not pile:
+                continue
+
+            # What is left of the other piles
+            rest, rest_big, rest_ones = total ^ pile, big - (pile > 1), ones - (pile == 1)
+            if rest_big:
+                candidates = [self.best_left(rest, 0, pile, positive)]
+            else:
+                # Leaving no or one object ends up with only single objects
+                candidates = [
+                    (self.value(0, 0, rest_ones + left), left) for left in (0, 1) if left < pile
+                ]
+                if pile > 2:
+                    candidates.append(self.best_left(rest, 2, pile, positive))
+            for value, left in candidates:
+                if best is None or value > best_q:
+                    best, best_q = (i, pile - left), value
+        return best_q, best
 
+    def best_future_reward(self, state):
+        """
+        Return the highest Q-value among the actions available in
+        `state`, or 0 if there are none.
+        """
+        return self.best_action(state)[0]
 
+    def choose_action(self, state, epsilon=True):
+        """
+        Given a state `state`, return an action `(i, j)` to take, as
+        NimAI.choose_action does.
+        """
+        if epsilon and self.rng.random() <= self.epsilon:
+            return self.random_action(state)
+        return self.best_action(state)[1]
 
 
-def train(n):
+class IndexedNim():
     """
-    Train an AI by playing `n` games against itself.
+    Nim game whose state is a StateSpace number and whose actions are
+    action numbers, for training without building lists or tuples.
     """
 
-    player = NimAI()
+    __slots__ = ("deltas", "state", "player", "winner")
 
-    # Play n games
-    for i in range(n):
-        print(f"Playing training game {i + 1}")
-        game = Nim()
+    def __init__(self, space):
+        """
+        Initialize a game for states numbered by `space`, at its
+        initial piles.
+        """
+        self.deltas = space.deltas
+        self.reset(space.index(space.initial))
 
-        # Keep track of last move made by either player
-        last = {
-            0: {"state": None, "action": None},
-            1: {"state": None, "action": None}
-        }
+    def reset(self, state):
+        """
+        Start a new game from state number `state`.
+        """
+        self.state = state
+        self.player = 0
+        self.winner = None
 
-        # Game loop
-        while True:
+    def move(self, action):
+        """
+        Make move number `action` for the current player, as Nim.move
+        does, without checking it.
+        """
+        self.state -= self.deltas[action]
+        self.player = 1 - self.player
+        if self.state == 0:
+            self.winner = self.player
+
+
+class IndexedSelfPlay():
+    """
+    Plays self-play games of a DenseNimAI on state and action numbers,
+    reusing one game and the per-player last-move slots from game to
+    game. Makes the same moves and updates as self_play, so it can be
+    passed to train in its place.
+    """
 
-            # Keep track of current state and action
-            state = game.piles.copy()
-            action = player.choose_action(game.piles)
+    __slots__ = ("game", "last_state", "last_action")
 
-            # Keep track of last state and action
-            last[game.player]["state"] = state
-            last[game.player]["action"] = action
+    def __init__(self):
+        self.game = None
+        self.last_state = [-1, -1]
+        self.last_action = [-1, -1]
 
-            # Make move
+    def __call__(self, player, initial=[1, 3, 5, 7]):
+        """
+        Play one game of `player` against itself from piles `initial`,
+        updating its Q-values as the game goes.
+        """
+        space = player.space
+        if self.game is None or self.game.deltas is not space.deltas:
+            self.game = IndexedNim(space)
+        game = self.game
+        game.reset(space.index(initial))
+        last_state = self.last_state
+        last_action = self.last_action
+        last_state[0] = last_state[1] = -1
+
+        while True:
+            state = game.state
+            action = player.choose(state)
+            last_state[game.player] = state
+            last_action[game.player] = action
             game.move(action)
-            new_state = game.piles.copy()
+            new_state = game.state
 
             # When game is over, update Q values with rewards
+            other = game.player
             if game.winner is not None:
-                player.update(state, action, new_state, -1)
-                player.update(
-                    last[game.player]["state"],
-                    last[game.player]["action"],
-                    new_state,
-                    1
-                )
+                player.learn(state, action, new_state, -1)
+                if last_state[other] >= 0:
+                    player.learn(last_state[other], last_action[other], new_state, 1)
                 break
 
             # If game is continuing, no rewards yet
-            elif last[game.player]["state"] is not None:
-                player.update(
-                    last[game.player]["state"],
-                    last[game.player]["action"],
-                    new_state,
-                    0
-                )
+            elif last_state[other] >= 0:
+                player.learn(last_state[other], last_action[other], new_state, 0)
+
+
+def self_play(player, initial=[1, 3, 5, 7]):
+    """
+    Play one game of `player` against itself from piles `initial`,
+    updating its Q-values as the game goes.
+    """
+
+    game = Nim(initial)
+
+    # Keep track of last move made by either player
+    last = {
+        0: {"state": None, "action": None},
+        1: {"state": None, "action": None}
+    }
+
+    # Game loop
+    while True:
 
-    print("Done training")
+        # Keep track of current state and action
+        state = game.piles.copy()
+        action = player.choose_action(game.piles)
+
+        # Keep track of last state and action
+        last[game.player]["state"] = state
+        last[game.player]["action"] = action
+
+        # Make move
+        game.move(action)
+        new_state = game.piles.copy()
+
+        # When game is over, update Q values with rewards
+        if game.winner is not None:
+            player.update(state, action, new_state, -1)
+            player.update(
+                last[game.player]["state"],
+                last[game.player]["action"],
+                new_state,
+                1
+            )
+            break
+
+        # If game is continuing, no rewards yet
+        elif last[game.player]["state"] is not None:
+            player.update(
+                last[game.player]["state"],
+                last[game.player]["action"],
+                new_state,
+                0
+            )
+
+
+def q_delta(old, new):
+    """
+    Returns the Euclidean norm of the change from Q-table `old` to
+    Q-table `new`, both dicts or both flat arrays.
+    """
+    if isinstance(new, dict):
+        keys = old.keys() | new.keys()
+        return math.sqrt(sum((new.get(key, 0) - old.get(key, 0)) ** 2 for key in keys))
+    return math.sqrt(sum((b - a) ** 2 for a, b in zip(old, new)))
+
+
+def copy_q(q):
+    """
+    Returns a copy of Q-table `q`, a dict or a flat array, for q_delta.
+    """
+    return dict(q) if isinstance(q, dict) else array("d", q)
+
+
+def train(n, initial=[1, 3, 5, 7], every=1000, target=None, log=sys.stdout,
+          player=None, play_game=None, rng=None):
+    """
+    Train an AI by playing up to `n` games against itself.
+
+    Every `every` games, the AI is measured against perfect play with
+    solver.evaluate and one JSON line of metrics is written to `log`:
+    games played, agreement and win rate, the norm of the change in
+    Q-values since the last line, and training speed. With `target`
+    set, training stops once the agreement reaches it.
+
+    `player` is a DenseNimAI for `initial` drawing from `rng` unless
+    given. Any of the AIs here can be passed: the dict-backed NimAI,
+    a DenseNimAI, or a LinearNimAI for piles too large for a table.
+    Each game is played and learned from by
+    `play_game(player, initial)`, by default IndexedSelfPlay for a
+    DenseNimAI and self_play otherwise. `rng` is only for the AI made
+    here; a `player` passed in keeps its own, and passing both is a
+    ValueError.
+    """
+
+    if player is not None and rng is not None:
+        raise ValueError("pass rng to the player's constructor, not to train")
+    player = player or DenseNimAI(initial=initial, rng=rng)
+    if play_game is None:
+        play_game = IndexedSelfPlay() if isinstance(player, DenseNimAI) else self_play
+    start = time.perf_counter()
+    previous = copy_q(player.q)
+
+    # Play n games
+    for i in range(1, n + 1):
+        play_game(player, initial)
+        if i % every and i != n:
+            continue
+
+        metrics = solver.evaluate(player, initial)
+        elapsed = time.perf_counter() - start
+        metrics.update(
+            games=i,
+            q_delta=q_delta(previous, player.q),
+            seconds=round(elapsed, 3),
+            games_per_second=round(i / elapsed) if elapsed else None
+        )
+        previous = copy_q(player.q)
+        if log is not None:
+            log.write(json.dumps(metrics) + "\n")
+        if target is not None and metrics["agreement"] >= target:
+            break
 
     # Return the trained AI
     return player
@@ -276,8 +853,6 @@ def play(ai, human_player=None):
             print(f"Pile {i}: {pile}")
         print()
 
-        # Compute available actions
-        available_actions = Nim.available_actions(game.piles)
         time.sleep(1)
 
         # Let human make a move
@@ -286,7 +861,7 @@ def play(ai, human_player=None):
             while True:
                 pile = int(input("Choose Pile: "))
                 count = int(input("Choose Count: "))
-                if (pile, count) in available_actions:
+                if (pile, count) in Nim.actions(game.piles):
                     break
                 print("Invalid move, try again.")
 
@@ -306,3 +881,4 @@ def play(ai, human_player=None):
             winner = "Human" if game.winner == human_player else "AI"
             print(f"Winner is {winner}")
             return
+
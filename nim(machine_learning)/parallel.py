@@ -0,0 +1,161 @@
+"""
+Parallel Nim training
+
+Self-play is split across a process pool in rounds. The current Q-table
+lives in shared memory, so it is never sent to the workers. Each round,
+every worker copies it into its own table, plays its share of games
+with its own seed, and sends back only the slots it updated: their new
+values and how many times each was updated. The changes are then
+merged into the shared table, either weighted by those visit counts or
+as a plain average over workers, and the next round starts from it.
+
+Usage: python parallel.py GAMES [--workers W] [--rounds R] [--seed S]
+                          [--merge visits|mean]
+"""
+
+import argparse
+import os
+import time
+from array import array
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+
+from nim import DenseNimAI, IndexedSelfPlay
+from streams import BlockRandom
+
+
+class CountingNimAI(DenseNimAI):
+
+    def __init__(self, alpha=0.5, epsilon=0.1, initial=[1, 3, 5, 7], rng=None, q=None):
+        """
+        DenseNimAI that also counts the updates `learn` makes to each
+        slot, in a dict from slot number to count.
+        """
+        super().__init__(alpha=alpha, epsilon=epsilon, initial=initial, rng=rng, q=q)
+        self.visits = dict()
+
+    def learn(self, index, action, new_index, reward):
+        super().learn(index, action, new_index, reward)
+        slot = index * self.width + action
+        self.visits[slot] = self.visits.get(slot, 0) + 1
+
+
+# The shared Q-table, and this worker's player and self-play loop
+_shared = None
+_player = None
+_play = None
+
+
+def _init_worker(name, initial, alpha, epsilon):
+    """
+    Attaches to the shared Q-table `name` and sets up the player that
+    the worker process trains each round.
+    """
+    global _shared, _player, _play
+    _shared = shared_memory.SharedMemory(name=name)
+    _player = CountingNimAI(alpha=alpha, epsilon=epsilon, initial=initial)
+    _play = IndexedSelfPlay()
+
+
+def worker_seed(seed, round, worker):
+    """
+    Returns the seed sequence for `worker` in `round`: the same on every
+    run, and independent of every other worker's and round's.
+    """
+    return np.random.SeedSequence(seed, spawn_key=(round, worker))
+
+
+def play_games(initial, games, seed):
+    """
+    Plays `games` games of self-play from the shared Q-table and returns
+    the numbers of the slots updated, their new values and how many
+    times each was updated. Run in a worker process.
+    """
+    player = _player
+    q = np.frombuffer(player.q, dtype=np.float64)
+    q[:] = np.frombuffer(_shared.buf, dtype=np.float64, count=len(q))
+    player.visits = dict()
+    player.rng = BlockRandom(seed)
+    for _ in range(games):
+        _play(player, initial)
+
+    slots = np.fromiter(player.visits.keys(), dtype=np.int64, count=len(player.visits))
+    counts = np.fromiter(player.visits.values(), dtype=np.int64, count=len(player.visits))
+    return slots, q[slots], counts
+
+
+def merge(base, results, weighted=True):
+    """
+    Merges the worker results into Q-table `base`, a NumPy array, in
+    place. Slots no worker updated keep their value.
+
+    Weighted by visits, each slot moves by the visit-weighted mean of
+    the workers' changes. Otherwise it moves by the mean change over
+    all workers, those that left it alone counting as no change.
+    """
+    slots = np.concatenate([slots for slots, _, _ in results])
+    values = np.concatenate([values for _, values, _ in results])
+    counts = np.concatenate([counts for _, _, counts in results])
+    change = values - base[slots]
+
+    updated, inverse = np.unique(slots, return_inverse=True)
+    if weighted:
+        base[updated] += np.bincount(inverse, counts * change) / np.bincount(inverse, counts)
+    else:
+        base[updated] += np.bincount(inverse, change) / len(results)
+
+
+def train_parallel(n, workers=None, rounds=10, initial=[1, 3, 5, 7],
+                   alpha=0.5, epsilon=0.1, seed=0, weighted=True):
+    """
+    Train an AI by playing `n` games against itself, spread over
+    `workers` processes and merged `rounds` times.
+    """
+    workers = workers or os.cpu_count()
+    player = DenseNimAI(alpha=alpha, epsilon=epsilon, initial=initial)
+    shared = shared_memory.SharedMemory(create=True, size=len(player.q) * 8)
+    try:
+        base = np.frombuffer(shared.buf, dtype=np.float64, count=len(player.q))
+        base[:] = 0.0
+
+        with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker,
+                                 initargs=(shared.name, initial, alpha, epsilon)) as pool:
+            for r in range(rounds):
+
+                # Split the games as evenly as possible over rounds and workers
+                games = n * (r + 1) // rounds - n * r // rounds
+                futures = [
+                    pool.submit(
+                        play_games, initial,
+                        games * (w + 1) // workers - games * w // workers,
+                        worker_seed(seed, r, w)
+                    )
+                    for w in range(workers)
+                ]
+
+                # Merge in worker order, so the result does not depend on timing
+                merge(base, [future.result() for future in futures], weighted)
+
+        player.q = array("d", base.tobytes())
+        del base
+    finally:
+        shared.close()
+        shared.unlink()
+    return player
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train a Nim AI in parallel.")
+    parser.add_argument("games", type=int)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--rounds", type=int, default=10)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--merge", choices=["visits", "mean"], default="visits")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    train_parallel(args.games, args.workers, args.rounds, seed=args.seed,
+                   weighted=args.merge == "visits")
+    print(f"Trained on {args.games} games in {time.perf_counter() - start:.2f}s")
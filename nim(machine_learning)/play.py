@@ -1,5 +1,15 @@
-from nim import train, play
+import os
+import sys
 
-ai = train(10000) 
-# ai = train(1) #testing purpose
+from nim import DenseNimAI, SNAPSHOT, train, play
+
+# Train with `python play.py train [GAMES]`, otherwise play the saved AI
+if len(sys.argv) > 1 and sys.argv[1] == "train":
+    ai = train(int(sys.argv[2]) if len(sys.argv) > 2 else 10000)
+    ai.save()
+    print(f"Saved AI to {SNAPSHOT}")
+elif os.path.exists(SNAPSHOT):
+    ai = DenseNimAI.load()
+else:
+    sys.exit("No saved AI yet; run `python play.py train` first.")
 play(ai)
@@ -0,0 +1,168 @@
+"""
+Experience replay with n-step returns for Nim
+
+nim.train makes one update per move while the game is played, in order,
+so a win or loss moves back only one move per game. ReplayTrainer waits
+for the game to end and then
+ - updates its moves from last to first, so the final reward reaches
+   the first move in the same game
+ - stores them in a fixed-size ring buffer, and learns from a batch
+   sampled from the buffer
+
+With `steps` above 1, each move is moved towards the best Q-value
+`steps` moves later for the same player, or the final reward if the game
+ends first. The return is cut short at the player's own next
+exploratory move, if one comes first; the opponent's moves are never
+checked.
+
+In self-play the opponent is the AI itself, so old transitions describe
+a weaker opponent than the current one. The buffer is therefore kept
+small: replaying a long history slows learning down. Because the
+opponent's exploratory moves are not cut at, they bias n-step returns,
+so `steps` defaults to 1.
+
+Usage:
+    trainer = ReplayTrainer()
+    ai = train(10000, player=trainer.ai, play_game=trainer.self_play)
+"""
+
+import random
+from array import array
+
+from nim import DenseNimAI, Nim, as_rng, train
+
+
+class ReplayBuffer():
+
+    def __init__(self, capacity=1 << 14):
+        """
+        Initialize an empty buffer of up to `capacity` transitions, held
+        in preallocated arrays. Each transition is
+         - `state`, `action`: the state and action numbers of a move
+         - `future`: the state number to bootstrap from, or -1 if the
+           game ended first
+         - `reward`: the reward collected before `future`
+        Once full, each new transition overwrites the oldest.
+        """
+        self.capacity = capacity
+        self.states = array("q", [0]) * capacity
+        self.actions = array("q", [0]) * capacity
+        self.futures = array("q", [0]) * capacity
+        self.rewards = array("d", [0.0]) * capacity
+        self.size = 0
+        self.next = 0
+
+    def __len__(self):
+        return self.size
+
+    def push(self, state, action, future, reward):
+        """
+        Add a transition, overwriting the oldest once the buffer is full.
+        """
+        n = self.next
+        self.states[n] = state
+        self.actions[n] = action
+        self.futures[n] = future
+        self.rewards[n] = reward
+        self.next = (n + 1) % self.capacity
+        self.size = min(self.size + 1, self.capacity)
+
+    def sample(self, k, rng=random):
+        """
+        Return the positions of `k` transitions drawn uniformly, with
+        replacement, from the buffer.
+        """
+        size = self.size
+        return [int(rng.random() * size) for _ in range(k)]
+
+
+class ReplayTrainer():
+
+    def __init__(self, ai=None, steps=1, capacity=256, batch=16, rng=None):
+        """
+        Train `ai`, a DenseNimAI, from `steps`-step returns, replaying
+        `batch` transitions from a buffer of `capacity` after each game.
+        Batches are sampled from `rng`, by default the AI's own.
+        """
+        self.ai = ai or DenseNimAI(rng=rng)
+        self.rng = self.ai.rng if rng is None else as_rng(rng)
+        self.steps = steps
+        self.batch = batch
+        self.buffer = ReplayBuffer(capacity)
+
+    def self_play(self, player, initial=[1, 3, 5, 7]):
+        """
+        Play one game of `player` against itself from piles `initial`,
+        learn from its moves last to first, store them, and learn from a
+        replayed batch. Has the signature of nim.self_play, so it can be
+        passed to nim.train.
+        """
+        space = player.space
+        width = player.width
+        q = player.q
+        game = Nim(initial)
+
+        # State and action numbers of the moves in order, and whether
+        # each was greedy
+        moves = []
+        while game.winner is None:
+            state = space.index(game.piles)
+            action = space.action_index[player.choose_action(game.piles)]
+            base = state * width
+            greedy = q[base + action] >= max(q[base + a] for a in space.legal_actions(state))
+            moves.append((state, action, greedy))
+            game.move(space.actions[action])
+
+        # The player who took the last object lost, and players alternate
+        transitions = [self.transition(moves, ply) for ply in range(len(moves))]
+        for transition in reversed(transitions):
+            self.update(player, *transition)
+        for transition in transitions:
+            self.buffer.push(*transition)
+        self.replay(player)
+
+    def transition(self, moves, ply):
+        """
+        Return `(state, action, future, reward)` for the move at `ply`
+        of a finished game.
+        """
+        state, action, _ = moves[ply]
+        end = ply + 2
+        while end < len(moves) and end < ply + 2 * self.steps and moves[end][2]:
+            end += 2
+        if end < len(moves):
+            return state, action, moves[end][0], 0
+
+        # The last move lost; the move before it won
+        return state, action, -1, -1 if (len(moves) - 1 - ply) % 2 == 0 else 1
+
+    def update(self, player, state, action, future, reward):
+        """
+        Move the Q-value of `action` in `state` towards `reward` plus the
+        best Q-value in state `future`, if there is one.
+        """
+        q = player.q
+        width = player.width
+        best = 0
+        if future >= 0:
+            base = future * width
+            best = max(q[base + a] for a in player.space.legal_actions(future))
+        slot = state * width + action
+        q[slot] += player.alpha * (reward + best - q[slot])
+
+    def replay(self, player):
+        """
+        Update `player` from a batch of transitions sampled from the
+        buffer.
+        """
+        buffer = self.buffer
+        for n in buffer.sample(self.batch, self.rng):
+            self.update(
+                player, buffer.states[n], buffer.actions[n],
+                buffer.futures[n], buffer.rewards[n]
+            )
+
+
+if __name__ == "__main__":
+    trainer = ReplayTrainer()
+    train(10000, player=trainer.ai, play_game=trainer.self_play, target=1.0)
@@ -0,0 +1,252 @@
+"""
+Nim game server
+
+Serves any number of concurrent Nim games against one shared AI over a
+line protocol, on a TCP port or on stdin and stdout. The AI is only
+asked for moves, never trained, so every session can share it.
+
+Each command is one line, and each reply ends with a PILES, WIN, LOSE,
+BYE or ERROR line:
+    NEW [first|second]  start a game, moving first or second (default
+                        first); the AI replies with its move if it goes
+                        first
+    MOVE i j            take j objects from pile i; the AI replies
+    QUIT                close the session
+Replies:
+    PILES a b c ...     the piles, with the client to move
+    AI i j              the AI took j objects from pile i
+    WIN / LOSE          the game is over
+    BYE                 the session is closing
+    ERROR message       the command was not understood or not legal
+
+A session reads its next command only once its last reply has been sent
+(`drain`), so a slow client holds up only itself, and sessions beyond
+--max-sessions are turned away.
+
+Games start from the piles the loaded AI was trained for, or from
+--piles with --solver (default 1 3 5 7).
+
+Usage: python server.py [--host H] [--port P] [--stdin] [--solver]
+                        [--piles P ...] [--snapshot FILE]
+                        [--max-sessions N]
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+
+from nim import DenseNimAI, Nim, SNAPSHOT
+from solver import NimSolver
+
+
+class Session():
+
+    def __init__(self, ai, initial, reader, writer):
+        """
+        Initialize a session for one client, with no game started.
+        Games start from piles `initial`.
+        """
+        self.ai = ai
+        self.initial = initial
+        self.reader = reader
+        self.writer = writer
+        self.game = None
+        self.human = 0
+
+    async def send(self, *lines):
+        """
+        Send `lines` and wait until the client has taken them.
+        """
+        self.writer.write("".join(line + "\n" for line in lines).encode())
+        await self.writer.drain()
+
+    def ai_move(self):
+        """
+        Make the AI's move and return the reply lines for it.
+        """
+        pile, count = self.ai.choose_action(self.game.piles, epsilon=False)
+        self.game.move((pile, count))
+        return [f"AI {pile} {count}"] + self.outcome()
+
+    def outcome(self):
+        """
+        Return the line that ends a reply: the result if the game is
+        over, or else the piles.
+        """
+        game = self.game
+        if game.winner is None:
+            return ["PILES " + " ".join(map(str, game.piles))]
+        result = "WIN" if game.winner == self.human else "LOSE"
+        self.game = None
+        return [result]
+
+    def command(self, line):
+        """
+        Carry out one command line and return the reply lines, or None
+        to close the session.
+        """
+        words = line.split()
+        if not words:
+            return ["ERROR empty command"]
+        name = words[0].upper()
+
+        if name == "QUIT":
+            return None
+
+        if name == "NEW":
+            order = words[1].lower() if len(words) > 1 else "first"
+            if order not in ("first", "second"):
+                return ["ERROR NEW takes first or second"]
+            self.game = Nim(self.initial)
+            self.human = 0 if order == "first" else 1
+            if self.human == 1:
+                return self.ai_move()
+            return self.outcome()
+
+        if name == "MOVE":
+            if self.game is None:
+                return ["ERROR no game in progress; send NEW"]
+            try:
+                pile, count = int(words[1]), int(words[2])
+            except (IndexError, ValueError):
+                return ["ERROR MOVE takes a pile and a count"]
+            if not (0 <= pile < len(self.game.piles) and 1 <= count <= self.game.piles[pile]):
+                return ["ERROR invalid move"]
+            self.game.move((pile, count))
+            if self.game.winner is not None:
+                return self.outcome()
+            return self.ai_move()
+
+        return [f"ERROR unknown command {words[0]}"]
+
+    async def run(self):
+        """
+        Serve commands until the client quits or disconnects.
+        """
+        try:
+            while True:
+                try:
+                    line = await self.reader.readline()
+                except ValueError:
+                    await self.send("ERROR line too long")
+                    break
+                if not line:
+                    break
+                reply = self.command(line.decode(errors="replace"))
+                if reply is None:
+                    await self.send("BYE")
+                    break
+                await self.send(*reply)
+        except ConnectionError:
+            pass
+        finally:
+            self.writer.close()
+
+
+class Server():
+
+    def __init__(self, ai, max_sessions=10000, initial=None):
+        """
+        Initialize a server for games against `ai`, hosting at most
+        `max_sessions` sessions at once. Games start from piles
+        `initial`, by default the piles a trained AI was trained for,
+        or [1, 3, 5, 7] for the solver.
+        """
+        space = getattr(ai, "space", None)
+        if initial is None:
+            initial = space.initial if space is not None else [1, 3, 5, 7]
+        elif space is not None and list(initial) != space.initial:
+            raise ValueError(f"AI was trained for piles {space.initial}, not {list(initial)}")
+        self.ai = ai
+        self.initial = list(initial)
+        self.max_sessions = max_sessions
+        self.sessions = 0
+
+    async def handle(self, reader, writer):
+        """
+        Serve one connection.
+        """
+        if self.sessions >= self.max_sessions:
+            writer.write(b"ERROR busy\n")
+            await writer.drain()
+            writer.close()
+            return
+        self.sessions += 1
+        try:
+            await Session(self.ai, self.initial, reader, writer).run()
+        finally:
+            self.sessions -= 1
+
+    async def serve(self, host, port):
+        """
+        Serve TCP connections on `host` and `port` until cancelled.
+        """
+        server = await asyncio.start_server(self.handle, host, port, limit=1024)
+        async with server:
+            await server.serve_forever()
+
+    async def serve_stdin(self):
+        """
+        Serve a single session on stdin and stdout.
+        """
+        stdio = Stdio()
+        await self.handle(stdio, stdio)
+
+
+class Stdio():
+    """
+    The reader and writer of a session on stdin and stdout, which may be
+    files or terminals rather than pipes. Lines are read on a thread so
+    the event loop keeps running.
+    """
+
+    async def readline(self):
+        return await asyncio.get_running_loop().run_in_executor(None, sys.stdin.buffer.readline)
+
+    def write(self, data):
+        sys.stdout.buffer.write(data)
+
+    async def drain(self):
+        sys.stdout.buffer.flush()
+
+    def close(self):
+        sys.stdout.buffer.flush()
+
+
+def load_ai(snapshot=SNAPSHOT, solver=False):
+    """
+    Return the AI to serve: the perfect player if `solver` is set, or
+    else the trained AI saved at `snapshot`.
+    """
+    if solver:
+        return NimSolver()
+    if not os.path.exists(snapshot):
+        sys.exit(f"No saved AI at {snapshot}; run `python play.py train` or use --solver.")
+    return DenseNimAI.load(snapshot)
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve Nim games against the AI.")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8765)
+    parser.add_argument("--stdin", action="store_true", help="serve one session on stdin and stdout")
+    parser.add_argument("--solver", action="store_true", help="play perfectly instead of loading an AI")
+    parser.add_argument("--piles", type=int, nargs="+", help="starting piles for --solver")
+    parser.add_argument("--snapshot", default=SNAPSHOT)
+    parser.add_argument("--max-sessions", type=int, default=10000)
+    args = parser.parse_args()
+
+    ai = load_ai(args.snapshot, args.solver)
+    try:
+        server = Server(ai, args.max_sessions, args.piles)
+    except ValueError as e:
+        sys.exit(str(e))
+    try:
+        if args.stdin:
+            asyncio.run(server.serve_stdin())
+        else:
+            print(f"Serving Nim on {args.host}:{args.port}")
+            asyncio.run(server.serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
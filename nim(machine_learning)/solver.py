@@ -0,0 +1,227 @@
+"""
+Exact Nim players
+
+NimSolver plays perfect Nim with nim-sum logic, in time linear in the
+number of piles, under either rule:
+ - normal play, where taking the last object wins
+ - misère play, where taking the last object loses, as in `Nim.move`
+
+TableSolver plays any subtraction variant, where only some counts may
+be taken at once, from a table of won and lost positions built by
+retrograde analysis. Its table for unrestricted Nim is the ground truth
+NimSolver is checked against.
+
+Usage: python solver.py [PILE ...] [--moves N ...] [--normal]
+"""
+
+import argparse
+import math
+import random
+from functools import reduce
+from operator import xor
+
+import nim
+
+
+def nim_sum(piles):
+    """
+    Returns the bitwise xor of the pile sizes.
+    """
+    return reduce(xor, piles, 0)
+
+
+def winning(piles, misere=True):
+    """
+    Returns True if the player to move in `piles` can force a win.
+    """
+    if misere and all(pile <= 1 for pile in piles):
+        # Only single objects left: whoever takes the last one loses
+        return sum(piles) % 2 == 0
+    return nim_sum(piles) != 0
+
+
+class NimSolver():
+
+    def __init__(self, misere=True):
+        """
+        Initialize a perfect player for misère Nim, or for normal-play
+        Nim if `misere` is False.
+        """
+        self.misere = misere
+
+    def choose_action(self, state, epsilon=False):
+        """
+        Given a state `state`, return a winning action `(i, j)` if there
+        is one. From a lost position, take one object from the largest
+        pile to make the game last as long as possible.
+
+        `epsilon` is accepted so the solver can stand in for a NimAI,
+        and ignored.
+        """
+        piles = list(state)
+        largest = max(range(len(piles)), key=lambda i: piles[i])
+        if piles[largest] == 0:
+            raise ValueError("No objects left to take")
+
+        # Misère play only differs once at most one pile has more than one
+        # object: then leave an odd number of single objects
+        if self.misere:
+            big = [i for i, pile in enumerate(piles) if pile > 1]
+            if len(big) == 1:
+                i = big[0]
+                ones = sum(piles) - piles[i]
+                return (i, piles[i] if ones % 2 else piles[i] - 1)
+            if not big:
+                return (largest, 1)
+
+        total = nim_sum(piles)
+        if total == 0:
+            return (largest, 1)
+        for i, pile in enumerate(piles):
+            if pile ^ total < pile:
+                return (i, pile - (pile ^ total))
+
+
+def retrograde(initial, moves=None, misere=True):
+    """
+    Returns the StateSpace of games starting from `initial`, and a
+    bytearray with a 1 for every state whose player to move can force a
+    win, when only counts in `moves` may be taken (any count if `moves`
+    is None).
+
+    Every move lowers the state number, so states are solved in
+    increasing order, each from states already solved.
+    """
+    space = nim.StateSpace(initial)
+    actions = [
+        (i, j, j * space.strides[i]) for i, j in space.actions
+        if moves is None or j in moves
+    ]
+    won = bytearray(space.size)
+    for index in range(space.size):
+        piles = space.piles(index)
+        legal = [delta for i, j, delta in actions if j <= piles[i]]
+        if not legal:
+            # The previous player took the last object, or no move is
+            # allowed: a win under misère rules, a loss under normal play
+            won[index] = misere
+        else:
+            won[index] = any(not won[index - delta] for delta in legal)
+    return space, won
+
+
+class TableSolver():
+
+    def __init__(self, initial=[1, 3, 5, 7], moves=None, misere=True):
+        """
+        Initialize a perfect player for games starting from `initial`
+        where only counts in `moves` may be taken at once.
+        """
+        self.moves = None if moves is None else set(moves)
+        self.space, self.won = retrograde(initial, self.moves, misere)
+
+    def choose_action(self, state, epsilon=False):
+        """
+        Given a state `state`, return a winning action `(i, j)` if there
+        is one, or else any legal action.
+        """
+        space = self.space
+        index = space.index(state)
+        legal = [
+            space.actions[n] for n in space.legal_actions(index)
+            if self.moves is None or space.actions[n][1] in self.moves
+        ]
+        if not legal:
+            raise ValueError("No legal moves left")
+        for i, j in legal:
+            if not self.won[index - j * space.strides[i]]:
+                return (i, j)
+        return legal[-1]
+
+
+def won_states(initial, samples, rng):
+    """
+    Returns every state of games from piles `initial` where the player
+    to move can force a win, or `samples` of them drawn at random if
+    there are more than `samples` states in all.
+    """
+    if math.prod(pile + 1 for pile in initial) <= samples:
+        space = nim.StateSpace(initial)
+        return [piles for piles in map(space.piles, range(1, space.size)) if winning(piles)]
+    won = []
+    while len(won) < samples:
+        piles = [rng.randint(0, pile) for pile in initial]
+        if any(piles) and winning(piles):
+            won.append(piles)
+    return won
+
+
+def evaluate(ai, initial=[1, 3, 5, 7], games=100, seed=0, samples=10000):
+    """
+    Measures how close `ai` is to perfect misère play from piles
+    `initial`, playing greedily. Returns a dict with
+     - `agreement`: the fraction of won states where the AI's move
+       keeps the win, over all of them or `samples` random ones
+     - `win_rate`: the fraction of `games` games the AI wins against
+       NimSolver, each starting from a random won state with the AI
+       to move
+
+    Uses its own random generator seeded with `seed`, so evaluating
+    does not change the course of training.
+    """
+    rng = random.Random(seed)
+    won = won_states(initial, samples, rng)
+
+    good = 0
+    for piles in won:
+        i, j = ai.choose_action(piles, epsilon=False)
+        piles = piles.copy()
+        piles[i] -= j
+        good += not winning(piles)
+
+    perfect = NimSolver()
+    wins = 0
+    for _ in range(games):
+        game = nim.Nim(rng.choice(won))
+        while game.winner is None:
+            player = ai if game.player == 0 else perfect
+            game.move(player.choose_action(game.piles, epsilon=False))
+        wins += game.winner == 0
+
+    return {
+        "agreement": good / len(won) if won else 1.0,
+        "win_rate": wins / games if games else None
+    }
+
+
+def check(initial, misere=True):
+    """
+    Checks NimSolver against the retrograde table on every state of
+    games starting from `initial`, and returns the number of states.
+    """
+    space, won = retrograde(initial, misere=misere)
+    solver = NimSolver(misere)
+    for index in range(1, space.size):
+        piles = space.piles(index)
+        if winning(piles, misere) != won[index]:
+            raise AssertionError(f"wrong value for {piles}")
+        i, j = solver.choose_action(piles)
+        if won[index] and won[index - j * space.strides[i]]:
+            raise AssertionError(f"missed a winning move from {piles}")
+    return space.size
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Solve Nim and its subtraction variants.")
+    parser.add_argument("piles", type=int, nargs="*", default=[1, 3, 5, 7])
+    parser.add_argument("--moves", type=int, nargs="+", help="counts that may be taken at once")
+    parser.add_argument("--normal", action="store_true", help="taking the last object wins")
+    args = parser.parse_args()
+
+    misere = not args.normal
+    if args.moves is None:
+        print(f"NimSolver agrees with the table on {check(args.piles, misere)} states")
+    space, won = retrograde(args.piles, args.moves, misere)
+    print(f"{sum(won)} of {space.size} states are won for the player to move")
+    start = space.index(args.piles)
+    print(f"Starting position is {'won' if won[start] else 'lost'} for the first player")
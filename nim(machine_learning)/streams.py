@@ -0,0 +1,67 @@
+"""
+Random number streams for Nim training
+
+Every NimAI takes an `rng` with the methods of `random.Random` that the
+AIs use: random, choice, randrange and randint. A `random.Random(seed)`
+gives an AI its own reproducible stream. BlockRandom does the same on
+top of a NumPy Generator, so NumPy seeds and streams can drive the AIs;
+a NimAI given a Generator wraps it in one. The AIs still draw one
+number per call, so it is no faster than `random.Random`. Only
+vectorized.BatchTrainer makes its epsilon checks in batches.
+
+spawn splits one seed into independent streams, for instance one per
+worker process, so parallel runs can be repeated exactly.
+"""
+
+import numpy as np
+
+
+class BlockRandom():
+
+    def __init__(self, generator=None, block=4096):
+        """
+        Initialize a stream drawing `block` numbers at a time from
+        `generator`, a NumPy Generator or anything np.random.default_rng
+        accepts as a seed.
+        """
+        self.generator = np.random.default_rng(generator)
+        self.size = block
+        self.block = []
+        self.next = 0
+
+    def random(self):
+        """
+        Returns the next float in [0, 1).
+        """
+        if self.next == len(self.block):
+            self.block = self.generator.random(self.size).tolist()
+            self.next = 0
+        value = self.block[self.next]
+        self.next += 1
+        return value
+
+    def randrange(self, n):
+        """
+        Returns a random integer in [0, n).
+        """
+        return int(self.random() * n)
+
+    def randint(self, a, b):
+        """
+        Returns a random integer in [a, b].
+        """
+        return a + self.randrange(b - a + 1)
+
+    def choice(self, seq):
+        """
+        Returns a random element of the non-empty sequence `seq`.
+        """
+        return seq[int(self.random() * len(seq))]
+
+
+def spawn(seed, n, block=4096):
+    """
+    Returns `n` independent BlockRandom streams derived from `seed`.
+    The same seed and `n` always give the same streams.
+    """
+    return [BlockRandom(child, block) for child in np.random.SeedSequence(seed).spawn(n)]
@@ -0,0 +1,153 @@
+"""
+Batched Q-learning for Nim
+
+Plays a thousand or so self-play games in lockstep with NumPy. States and
+actions are integer indices into a dense Q-array:
+ - a state is the mixed-radix number whose digits are the pile sizes,
+   so for piles [1, 3, 5, 7] there are 2 * 4 * 6 * 8 = 384 states
+ - action `(i, j)` is `offsets[i] + j - 1`, so there are sum(piles)
+   actions, 16 for [1, 3, 5, 7]
+
+Each step picks epsilon-greedy actions and applies the same Q-learning
+updates as `nim.train` for every game in the batch at once.
+"""
+
+from array import array
+
+import numpy as np
+
+from nim import DenseNimAI, StateSpace
+
+
+class BatchTrainer():
+
+    def __init__(self, initial=[1, 3, 5, 7], alpha=0.5, epsilon=0.1, batch=1024, seed=None):
+        """
+        Set up a dense Q-array for games starting from piles `initial`,
+        trained `batch` games at a time.
+        """
+        self.initial = list(initial)
+        self.alpha = alpha
+        self.epsilon = epsilon
+        self.batch = batch
+        self.rng = np.random.default_rng(seed)
+
+        # Same numbering as nim.StateSpace, so the Q-array can be exported
+        space = StateSpace(self.initial)
+        self.strides = np.array(space.strides)
+        self.states = space.size
+        self.start = space.index(self.initial)
+
+        # Pile and count of each action, and how much it lowers the index
+        self.action_pile = np.array([i for i, _ in space.actions])
+        self.action_count = np.array([j for _, j in space.actions])
+        self.action_delta = self.action_count * self.strides[self.action_pile]
+
+        # legal[s, a] is True when action a can be taken in state s
+        radix = np.array(self.initial) + 1
+        piles = (np.arange(self.states)[:, None] // self.strides) % radix
+        self.legal = piles[:, self.action_pile] >= self.action_count
+
+        self.q = np.zeros((self.states, len(self.action_pile)))
+
+    def best_future_reward(self, states):
+        """
+        Returns the highest Q-value over the legal actions of each state,
+        or 0 for states with no actions.
+        """
+        values = np.where(self.legal[states], self.q[states], -np.inf).max(axis=1)
+        return np.where(np.isfinite(values), values, 0.0)
+
+    def choose_actions(self, states):
+        """
+        Returns an epsilon-greedy action for each state, breaking ties
+        between equally good actions at random.
+        """
+        legal = self.legal[states]
+        noise = self.rng.random(legal.shape)
+        greedy = self.q[states] + noise * 1e-9
+        explore = self.rng.random(len(states)) < self.epsilon
+        scores = np.where(explore[:, None], noise, greedy)
+        return np.where(legal, scores, -np.inf).argmax(axis=1)
+
+    def update(self, states, actions, new_states, rewards):
+        """
+        Applies one Q-learning update per game. Games that share a
+        `(state, action)` pair are averaged into a single update, so a
+        big batch cannot overshoot.
+        """
+        old = self.q[states, actions]
+        error = rewards + self.best_future_reward(new_states) - old
+        pairs, inverse = np.unique(states * self.q.shape[1] + actions, return_inverse=True)
+        mean = np.bincount(inverse, weights=error) / np.bincount(inverse)
+        self.q.flat[pairs] += self.alpha * mean
+
+    def train(self, n):
+        """
+        Trains on `n` games of self-play, `batch` games at a time.
+        """
+        played = 0
+        while played < n:
+            size = min(self.batch, n - played)
+            self.play_batch(size)
+            played += size
+        return self
+
+    def play_batch(self, size):
+        """
+        Plays `size` games in lockstep until all of them are over.
+        """
+        games = np.arange(size)
+        state = np.full(size, self.start)
+        player = 0
+
+        # Last state and action of each player in each game, -1 if none
+        last_state = np.full((2, size), -1)
+        last_action = np.full((2, size), -1)
+
+        # All games move in step, so every game has the same player to move
+        while len(games):
+            s = state[games]
+            a = self.choose_actions(s)
+            new_s = s - self.action_delta[a]
+            last_state[player, games] = s
+            last_action[player, games] = a
+
+            # Games that just ended: the mover loses, the other player wins
+            over = new_s == 0
+            other = 1 - player
+            if over.any():
+                self.update(s[over], a[over], new_s[over], -1.0)
+
+                # A game can end on its first move, before the other player
+                # has moved
+                won = over & (last_state[other, games] >= 0)
+                if won.any():
+                    ended = games[won]
+                    self.update(last_state[other, ended], last_action[other, ended], new_s[won], 1.0)
+
+            # Games still going: reward the other player's last move with 0
+            going = ~over & (last_state[other, games] >= 0)
+            if going.any():
+                cont = games[going]
+                self.update(last_state[other, cont], last_action[other, cont], new_s[going], 0.0)
+
+            state[games] = new_s
+            games = games[~over]
+            player = other
+
+    def to_ai(self):
+        """
+        Returns a DenseNimAI holding the trained Q-values, for use with
+        `play`.
+        """
+        ai = DenseNimAI(alpha=self.alpha, epsilon=self.epsilon, initial=self.initial)
+        ai.q = array("d", self.q.ravel().tobytes())
+        return ai
+
+
+def train(n, batch=1024, seed=None):
+    """
+    Train an AI by playing `n` games against itself, `batch` at a time.
+    """
+    return BatchTrainer(batch=batch, seed=seed).train(n).to_ai()
@@ -0,0 +1,104 @@
+"""
+Batch evaluation of tic-tac-toe positions
+
+Boards come in as an N x 9 integer array, one row per board in
+row-major cell order, with 0 for empty, 1 for X and 2 for O. Every
+board is scored at once with array operations against the shared
+solution table, rather than by calling minimax once per board.
+"""
+
+import numpy as np
+
+import solve
+import tictactoe as ttt
+
+# Weight of each cell in the base-3 board code, as in tictactoe.encode
+POWERS = 3 ** np.arange(8, -1, -1, dtype=np.int64)
+
+LINES = np.array(ttt.LINES)
+
+# Rows handled per step, to bound the size of temporary arrays
+CHUNK = 1 << 18
+
+_table = None
+
+
+def table():
+    """
+    Returns the solution table as a read-only uint8 array, mapping
+    solution.bin if it has been built and solving the game otherwise.
+    """
+
+    global _table
+    if _table is None:
+        solved = ttt.solution()
+        if solved is None:
+            solved = solve.table()
+        _table = np.frombuffer(solved, dtype=np.uint8)
+    return _table
+
+
+def encode(boards):
+    """
+    Returns the base-3 code of each board.
+    """
+
+    return np.asarray(boards, dtype=np.int64) @ POWERS
+
+
+def winners(boards):
+    """
+    Returns 1 for each board X has won, -1 for each board O has won and
+    0 for the rest.
+    """
+
+    lines = np.asarray(boards)[:, LINES]
+    x_won = (lines == 1).all(axis=2).any(axis=1)
+    o_won = (lines == 2).all(axis=2).any(axis=1)
+    return x_won.astype(np.int8) - o_won.astype(np.int8)
+
+
+def evaluate(boards):
+    """
+    Returns `(moves, values)` for an N x 9 array of boards.
+
+    `moves` holds the best cell, 3 * i + j, for the player to move, or
+    -1 when the game is over or the board cannot arise in play.
+    `values` holds the minimax value, 1 if X wins, -1 if O wins and 0
+    for a draw; boards that cannot arise in play get the value of who
+    has a line on them.
+    """
+
+    boards = np.asarray(boards)
+    if boards.ndim != 2 or boards.shape[1] != 9:
+        raise ValueError("boards must be an N x 9 array")
+    if boards.size and (boards.min() < 0 or boards.max() > 2):
+        raise ValueError("cells must be 0 (empty), 1 (X) or 2 (O)")
+
+    solved = table()
+    moves = np.empty(len(boards), dtype=np.int8)
+    values = np.empty(len(boards), dtype=np.int8)
+    for start in range(0, len(boards), CHUNK):
+        chunk = boards[start:start + CHUNK]
+        entries = solved[encode(chunk)]
+        reachable = entries != ttt.UNREACHABLE
+        move = (entries & 0xF).astype(np.int8)
+        move[~reachable | (move == ttt.NO_MOVE)] = -1
+        value = (entries >> 4).astype(np.int8) - 1
+        if not reachable.all():
+            value[~reachable] = winners(chunk[~reachable])
+        moves[start:start + CHUNK] = move
+        values[start:start + CHUNK] = value
+    return moves, values
+
+
+def from_boards(boards):
+    """
+    Returns the N x 9 array for a sequence of boards in list form.
+    """
+
+    marks = {ttt.EMPTY: 0, ttt.X: 1, ttt.O: 2}
+    return np.array(
+        [[marks[cell] for row in board for cell in row] for board in boards],
+        dtype=np.int8
+    ).reshape(-1, 9)
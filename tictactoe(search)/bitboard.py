@@ -0,0 +1,228 @@
+"""
+Tic Tac Toe Player on a bitboard
+
+A position is a pair of 9-bit integers `(x, o)`, one per side, where
+bit `3 * i + j` is set when that side holds cell `(i, j)`.
+"""
+
+import math
+
+import tictactoe as ttt
+
+X = ttt.X
+O = ttt.O
+EMPTY = ttt.EMPTY
+
+FULL = 0b111111111
+
+# Every row, column and diagonal as a mask over the nine cells
+WIN_MASKS = (
+    0b000000111, 0b000111000, 0b111000000,
+    0b001001001, 0b010010010, 0b100100100,
+    0b100010001, 0b001010100
+)
+
+# Cell masks and the (i, j) action each bit stands for
+CELLS = tuple(1 << k for k in range(9))
+MOVES = tuple((k // 3, k % 3) for k in range(9))
+
+
+def from_board(board):
+    """
+    Returns the bitboard for a board in list form.
+    """
+
+    x = o = 0
+    for i in range(3):
+        for j in range(3):
+            if board[i][j] == X:
+                x |= 1 << (3 * i + j)
+            elif board[i][j] == O:
+                o |= 1 << (3 * i + j)
+    return (x, o)
+
+
+def to_board(state):
+    """
+    Returns the list form of a bitboard, as used by runner.py.
+    """
+
+    x, o = state
+    board = ttt.initial_state()
+    for k in range(9):
+        if x >> k & 1:
+            board[k // 3][k % 3] = X
+        elif o >> k & 1:
+            board[k // 3][k % 3] = O
+    return board
+
+
+def initial_state():
+    """
+    Returns starting state of the board.
+    """
+
+    return (0, 0)
+
+
+def player(state):
+    """
+    Returns player who has the next turn on a board.
+    """
+
+    x, o = state
+    return O if x.bit_count() > o.bit_count() else X
+
+
+def actions(state):
+    """
+    Returns set of all possible actions (i, j) available on the board.
+    """
+
+    free = FULL & ~(state[0] | state[1])
+    return {MOVES[k] for k in range(9) if free >> k & 1}
+
+
+def result(state, action):
+    """
+    Returns the board that results from making move (i, j) on the board.
+    """
+
+    i, j = action
+    bit = 1 << (3 * i + j)
+    x, o = state
+    if (x | o) & bit:
+        raise ValueError(f"Cell {action} is already taken")
+    if x.bit_count() > o.bit_count():
+        return (x, o | bit)
+    return (x | bit, o)
+
+
+def has_line(bits):
+    """
+    Returns True if the cells in `bits` cover a row, column or diagonal.
+    """
+
+    for mask in WIN_MASKS:
+        if bits & mask == mask:
+            return True
+    return False
+
+
+def winner(state):
+    """
+    Returns the winner of the game, if there is one.
+    """
+
+    if has_line(state[0]):
+        return X
+    elif has_line(state[1]):
+        return O
+    return None
+
+
+def terminal(state):
+    """
+    Returns True if game is over, False otherwise.
+    """
+
+    x, o = state
+    return (x | o) == FULL or has_line(x) or has_line(o)
+
+
+def utility(state):
+    """
+    Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+    """
+
+    if has_line(state[0]):
+        return 1
+    elif has_line(state[1]):
+        return -1
+    return 0
+
+
+def minimax(state):
+    """
+    Returns the optimal action for the current player on the board.
+    """
+
+    x, o = state
+    if terminal(state):
+        return (None, None)
+
+    # Search from the point of view of the side to move
+    if x.bit_count() > o.bit_count():
+        me, them = o, x
+    else:
+        me, them = x, o
+
+    best, v = None, -math.inf
+    free = FULL & ~(x | o)
+    for k in range(9):
+        bit = CELLS[k]
+        if free & bit:
+            current = -_negamax(them, me | bit)
+            if current > v:
+                v, best = current, MOVES[k]
+    return best
+
+
+def value(state):
+    """
+    Returns the game-theoretic value of the board: 1 if X wins with
+    perfect play, -1 if O wins, 0 for a draw.
+    """
+
+    x, o = state
+    if x.bit_count() > o.bit_count():
+        return -_negamax(o, x)
+    return _negamax(x, o)
+
+
+def _negamax(me, them):
+    """
+    Returns the value of the position for the side holding `me`, who is
+    to move, given that the side holding `them` has just moved.
+    """
+
+    # Only the player who just moved can have completed a line
+    if has_line(them):
+        return -1
+    occupied = me | them
+    if occupied == FULL:
+        return 0
+    v = -1
+    for bit in CELLS:
+        if not occupied & bit:
+            current = -_negamax(them, me | bit)
+            if current > v:
+                v = current
+    return v
+
+
+def rollout(state, rng):
+    """
+    Plays random moves from the board until the game ends, using `rng`
+    (a random.Random), and returns the utility of the final board.
+    """
+
+    x, o = state
+    if has_line(x):
+        return 1
+    elif has_line(o):
+        return -1
+    x_to_move = x.bit_count() == o.bit_count()
+    free = [bit for bit in CELLS if not (x | o) & bit]
+    rng.shuffle(free)
+    for bit in free:
+        if x_to_move:
+            x |= bit
+            if has_line(x):
+                return 1
+        else:
+            o |= bit
+            if has_line(o):
+                return -1
+        x_to_move = not x_to_move
+    return 0
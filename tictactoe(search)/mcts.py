@@ -0,0 +1,147 @@
+"""
+Monte Carlo Tree Search Player
+
+An anytime alternative to minimax: it plays random games from the
+current board, grows a search tree towards the moves that win most
+often (UCT), and stops after a number of playouts or a time budget.
+It works with any game offering the tictactoe functions, such as the
+tictactoe module itself or an mnk.Game.
+"""
+
+import math
+import random
+import time
+
+import bitboard as bb
+import tictactoe as ttt
+
+
+class Node():
+    """
+    Search tree node for the board reached by `action`.
+
+    `wins` is scored for the player who made `action`: 1 for a win and
+    0.5 for a draw.
+    """
+
+    def __init__(self, game, board, parent=None, action=None):
+        self.board = board
+        self.parent = parent
+        self.action = action
+        self.mover = game.player(parent.board) if parent is not None else None
+        self.children = []
+        self.untried = [] if game.terminal(board) else list(game.actions(board))
+        self.visits = 0
+        self.wins = 0.0
+
+
+class MCTS():
+    """
+    UCT search for the current player, with `c` as the exploration
+    constant.
+
+    Each move runs `playouts` playouts, or as many as fit in `budget`
+    seconds if that is set. The tree is kept between calls, so the part
+    under the board the opponent left is reused on the next move.
+    """
+
+    def __init__(self, game=ttt, playouts=1000, budget=None, c=math.sqrt(2), rng=None):
+        self.game = game
+        self.playouts = playouts
+        self.budget = budget
+        self.c = c
+        self.rng = rng or random.Random()
+        self.root = None
+
+    def choose(self, board):
+        """
+        Returns the best action for the current player on the board.
+        """
+        game = self.game
+        if game.terminal(board):
+            return (None, None)
+
+        self.root = self.reuse(board) or Node(game, board)
+        deadline = None if self.budget is None else time.perf_counter() + self.budget
+        count = 0
+        while True:
+            if deadline is None:
+                if count >= self.playouts:
+                    break
+            elif count and time.perf_counter() >= deadline:
+                break
+            self.playout(self.root)
+            count += 1
+
+        best = max(self.root.children, key=lambda child: child.visits)
+        return best.action
+
+    def minimax(self, board):
+        """
+        Same as `choose`, so a search can stand in for a game module.
+        """
+        return self.choose(board)
+
+    def reuse(self, board):
+        """
+        Returns the node for `board` if it is the last root or a child or
+        grandchild of it, detached from the rest of the tree.
+        """
+        if self.root is None:
+            return None
+        frontier = [self.root]
+        for _ in range(3):
+            for node in frontier:
+                if node.board == board:
+                    node.parent = None
+                    return node
+            frontier = [child for node in frontier for child in node.children]
+        return None
+
+    def playout(self, root):
+        """
+        Selects a leaf by UCT, expands it, plays a random game from it,
+        and backs the result up the tree.
+        """
+        game = self.game
+
+        # Select
+        node = root
+        while not node.untried and node.children:
+            log_visits = math.log(node.visits)
+            node = max(node.children, key=lambda child: (
+                child.wins / child.visits + self.c * math.sqrt(log_visits / child.visits)
+            ))
+
+        # Expand
+        if node.untried:
+            action = node.untried.pop(self.rng.randrange(len(node.untried)))
+            child = Node(game, game.result(node.board, action), node, action)
+            node.children.append(child)
+            node = child
+
+        # Simulate
+        utility = self.rollout(node.board)
+
+        # Back up
+        while node is not None:
+            node.visits += 1
+            if utility == 0:
+                node.wins += 0.5
+            elif (utility == 1) == (node.mover == ttt.X):
+                node.wins += 1
+            node = node.parent
+
+    def rollout(self, board):
+        """
+        Returns the utility of a random game played out from the board,
+        on the most compact board the game has.
+        """
+        game = self.game
+        if game is ttt:
+            return bb.rollout(bb.from_board(board), self.rng)
+        if hasattr(game, "rollout"):
+            return game.rollout(board, self.rng)
+        while not game.terminal(board):
+            board = game.result(board, self.rng.choice(list(game.actions(board))))
+        return game.utility(board)
@@ -0,0 +1,385 @@
+"""
+m,n,k-game Player
+
+Tic-tac-toe generalized to a board of `rows` by `cols` where `k` in a
+row wins, e.g. 4x4 four-in-a-row or 15x15 Gomoku. Boards use the same
+list form as tictactoe.py, and a `Game` offers the same functions, so
+runner.py can use either one.
+
+A full minimax is out of reach on big boards, so `Game.minimax` runs an
+iterative-deepening alpha-beta search under a wall-clock budget and
+scores the leaves with a line-threat evaluation.
+"""
+
+import math
+import time
+
+import tictactoe as ttt
+
+# Score of a won game; wins found sooner score a little higher
+WIN = 10 ** 9
+
+
+class Timeout(Exception):
+    """
+    Raised inside a search when its time budget runs out.
+    """
+
+
+class Game():
+
+    X = ttt.X
+    O = ttt.O
+    EMPTY = ttt.EMPTY
+
+    def __init__(self, rows=3, cols=3, k=3, budget=1.0, max_depth=None):
+        """
+        Set up a `rows` by `cols` board where `k` in a row wins.
+        `budget` is the time in seconds `minimax` may take per move,
+        and `max_depth` caps how many plies it looks ahead.
+        """
+        if k > max(rows, cols):
+            raise ValueError("k must fit on the board")
+        self.rows = rows
+        self.cols = cols
+        self.k = k
+        self.budget = budget
+        self.max_depth = max_depth or rows * cols
+
+        # Every window of k cells in a row, as flat cell indices
+        self.lines = []
+        for i in range(rows):
+            for j in range(cols):
+                for di, dj in ((0, 1), (1, 0), (1, 1), (1, -1)):
+                    end_i, end_j = i + di * (k - 1), j + dj * (k - 1)
+                    if 0 <= end_i < rows and 0 <= end_j < cols:
+                        self.lines.append(tuple(
+                            (i + di * n) * cols + (j + dj * n) for n in range(k)
+                        ))
+
+        # Windows through each cell
+        self.cell_lines = [[] for _ in range(rows * cols)]
+        for index, line in enumerate(self.lines):
+            for cell in line:
+                self.cell_lines[cell].append(index)
+
+        # Cells next to each cell, for picking candidate moves
+        self.neighbors = []
+        for i in range(rows):
+            for j in range(cols):
+                self.neighbors.append([
+                    r * cols + c
+                    for r in range(max(0, i - 1), min(rows, i + 2))
+                    for c in range(max(0, j - 1), min(cols, j + 2))
+                    if (r, c) != (i, j)
+                ])
+
+        # Worth of an open window holding n stones of one side
+        self.weights = [0] + [4 ** n for n in range(1, k)] + [WIN]
+
+    def initial_state(self):
+        """
+        Returns starting state of the board.
+        """
+        return [[self.EMPTY] * self.cols for _ in range(self.rows)]
+
+    def player(self, board):
+        """
+        Returns player who has the next turn on a board.
+        """
+        x_count = sum(row.count(self.X) for row in board)
+        o_count = sum(row.count(self.O) for row in board)
+        return self.O if x_count > o_count else self.X
+
+    def actions(self, board):
+        """
+        Returns set of all possible actions (i, j) available on the board.
+        """
+        return {
+            (i, j)
+            for i in range(self.rows)
+            for j in range(self.cols)
+            if board[i][j] == self.EMPTY
+        }
+
+    def result(self, board, action):
+        """
+        Returns the board that results from making move (i, j) on the board.
+        """
+        i, j = action
+        if board[i][j] != self.EMPTY:
+            raise ValueError(f"Cell {action} is already taken")
+        new_board = [row.copy() for row in board]
+        new_board[i][j] = self.player(board)
+        return new_board
+
+    def winner(self, board):
+        """
+        Returns the winner of the game, if there is one.
+        """
+        cols = self.cols
+        for line in self.lines:
+            first = board[line[0] // cols][line[0] % cols]
+            if first != self.EMPTY and all(
+                board[cell // cols][cell % cols] == first for cell in line
+            ):
+                return first
+        return None
+
+    def terminal(self, board):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        if self.winner(board) is not None:
+            return True
+        return all(cell != self.EMPTY for row in board for cell in row)
+
+    def utility(self, board):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        winner = self.winner(board)
+        if winner == self.X:
+            return 1
+        elif winner == self.O:
+            return -1
+        return 0
+
+    def minimax(self, board, stop=None):
+        """
+        Returns the best action found for the current player on the
+        board within the time budget, or sooner if the threading.Event
+        `stop` is set.
+        """
+        if self.terminal(board):
+            return (None, None)
+        deadline = time.perf_counter() + self.budget
+        search = Search(self, Position(self, board), deadline, stop)
+        cell = search.run()
+        return (cell // self.cols, cell % self.cols)
+
+    def rollout(self, board, rng):
+        """
+        Plays random moves from the board until the game ends, using `rng`
+        (a random.Random), and returns the utility of the final board.
+        """
+        position = Position(self, board)
+        free = [cell for cell, side in enumerate(position.cells) if side == 0]
+        rng.shuffle(free)
+        for cell in free:
+            if position.won:
+                break
+            position.play(cell)
+        return position.won
+
+
+class Position():
+    """
+    Flat, mutable board that keeps the line-threat score up to date as
+    moves are made and undone, touching only the windows through the
+    cell that changed.
+    """
+
+    def __init__(self, game, board):
+        self.game = game
+        self.cells = [0] * (game.rows * game.cols)
+
+        # Stones of X and of O in each window
+        self.x_counts = [0] * len(game.lines)
+        self.o_counts = [0] * len(game.lines)
+
+        # Stones next to each cell
+        self.near = [0] * len(self.cells)
+
+        # Score from X's point of view, and the side that has won, if any
+        self.score = 0
+        self.won = 0
+        self.history = []
+
+        # Add the stones already on the board
+        x_count = o_count = 0
+        for i, row in enumerate(board):
+            for j, cell in enumerate(row):
+                if cell == game.X:
+                    self.place(i * game.cols + j, 1)
+                    x_count += 1
+                elif cell == game.O:
+                    self.place(i * game.cols + j, -1)
+                    o_count += 1
+        self.history.clear()
+        self.to_move = -1 if x_count > o_count else 1
+
+    def contribution(self, line):
+        """
+        Returns what window `line` adds to the score.
+        """
+        x, o = self.x_counts[line], self.o_counts[line]
+        if o == 0:
+            return self.game.weights[x]
+        elif x == 0:
+            return -self.game.weights[o]
+        return 0
+
+    def place(self, cell, side):
+        """
+        Puts a stone of `side` (1 for X, -1 for O) on `cell`.
+        """
+        k = self.game.k
+        counts = self.x_counts if side == 1 else self.o_counts
+        self.history.append((cell, self.won))
+        self.cells[cell] = side
+        for line in self.game.cell_lines[cell]:
+            before = self.contribution(line)
+            counts[line] += 1
+            self.score += self.contribution(line) - before
+            if counts[line] == k:
+                self.won = side
+        for neighbor in self.game.neighbors[cell]:
+            self.near[neighbor] += 1
+
+    def play(self, cell):
+        """
+        Makes a move for the side to move.
+        """
+        self.place(cell, self.to_move)
+        self.to_move = -self.to_move
+
+    def undo(self):
+        """
+        Takes back the last move.
+        """
+        cell, self.won = self.history.pop()
+        side = self.cells[cell]
+        counts = self.x_counts if side == 1 else self.o_counts
+        for line in self.game.cell_lines[cell]:
+            before = self.contribution(line)
+            counts[line] -= 1
+            self.score += self.contribution(line) - before
+        for neighbor in self.game.neighbors[cell]:
+            self.near[neighbor] -= 1
+        self.cells[cell] = 0
+        self.to_move = side
+
+    def candidates(self):
+        """
+        Returns the empty cells worth searching: every empty cell on small
+        boards, otherwise only those next to a stone.
+        """
+        cells = self.cells
+        if len(cells) <= 25:
+            return [cell for cell in range(len(cells)) if cells[cell] == 0]
+        near = self.near
+        moves = [cell for cell in range(len(cells)) if cells[cell] == 0 and near[cell]]
+        if not moves:
+            center = (self.game.rows // 2) * self.game.cols + self.game.cols // 2
+            moves = [center] if cells[center] == 0 else [
+                cell for cell in range(len(cells)) if cells[cell] == 0
+            ]
+        return moves
+
+
+class Search():
+    """
+    Iterative-deepening negamax with alpha-beta pruning over a Position,
+    stopped by raising Timeout once the deadline passes or the
+    threading.Event `stop`, if given, is set.
+    """
+
+    def __init__(self, game, position, deadline, stop=None):
+        self.game = game
+        self.position = position
+        self.deadline = deadline
+        self.stop = stop
+        self.nodes = 0
+        self.depth = 0
+
+    def run(self):
+        """
+        Returns the best cell from the deepest search that finished.
+        """
+        position = self.position
+        moves = self.ordered(position.candidates())
+        best = moves[0]
+        depth_cap = min(self.game.max_depth, position.cells.count(0))
+        for depth in range(1, depth_cap + 1):
+            try:
+                value, cell = self.root(moves, depth)
+            except Timeout:
+                break
+            best, self.depth = cell, depth
+
+            # Search the best move first next time
+            moves.remove(cell)
+            moves.insert(0, cell)
+            if abs(value) >= WIN - self.game.rows * self.game.cols:
+                break
+        return best
+
+    def root(self, moves, depth):
+        """
+        Returns the value and cell of the best root move at `depth`.
+        """
+        position = self.position
+        alpha, beta = -math.inf, math.inf
+        best = moves[0]
+        for cell in moves:
+            position.play(cell)
+            try:
+                value = -self.negamax(depth - 1, -beta, -alpha, 1)
+            finally:
+                position.undo()
+            if value > alpha:
+                alpha, best = value, cell
+        return alpha, best
+
+    def negamax(self, depth, alpha, beta, ply):
+        """
+        Returns the value of the position for the side to move.
+        """
+        self.nodes += 1
+        if self.nodes & 1023 == 0:
+            if time.perf_counter() > self.deadline:
+                raise Timeout
+            if self.stop is not None and self.stop.is_set():
+                raise Timeout
+
+        position = self.position
+        if position.won:
+            return -(WIN - ply)
+        moves = position.candidates()
+        if not moves:
+            return 0
+        if depth == 0:
+            return position.score * position.to_move
+
+        if depth > 1:
+            moves = self.ordered(moves)
+        value = -math.inf
+        for cell in moves:
+            position.play(cell)
+            try:
+                current = -self.negamax(depth - 1, -beta, -alpha, ply + 1)
+            finally:
+                position.undo()
+            if current > value:
+                value = current
+                if value > alpha:
+                    alpha = value
+                    if alpha >= beta:
+                        break
+        return value
+
+    def ordered(self, moves):
+        """
+        Returns `moves` sorted by how much each improves the score for the
+        side to move.
+        """
+        position = self.position
+        side = position.to_move
+        scored = []
+        for cell in moves:
+            position.play(cell)
+            scored.append((position.score * side, cell))
+            position.undo()
+        scored.sort(reverse=True)
+        return [cell for _, cell in scored]
@@ -0,0 +1,164 @@
+"""
+Parallel root-split search for the m,n,k engine
+
+The first root move is searched on its own to get a bound (the "young
+brothers wait" rule), then the remaining root moves are shared out to a
+process pool. Workers publish the best root value found so far through
+shared memory and use it as their alpha bound.
+
+Each root move is searched with the window just below the best value
+seen, so every move that could tie for best gets an exact score, and
+ties go to the earliest move in the search order. The move returned is
+therefore the same for any worker count.
+
+Usage: python parallel.py [--rows R] [--cols C] [--k K] [--depth D]
+                          [--workers 1 2 4 8 16]
+"""
+
+import argparse
+import math
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mnk
+
+# Best root value so far, shared with the worker processes
+_alpha = None
+
+
+def _init_worker(alpha):
+    """
+    Keeps the shared bound in each worker process.
+    """
+    global _alpha
+    _alpha = alpha
+
+
+def _search_move(game, board, cell, depth):
+    """
+    Returns the value of root move `cell` for the side to move, exact
+    whenever it is at least the shared bound at the time it starts.
+    """
+    position = mnk.Position(game, board)
+    search = mnk.Search(game, position, math.inf)
+    alpha = _alpha.value
+    position.play(cell)
+    value = -search.negamax(depth - 1, -math.inf, -(alpha - 1), 1)
+    with _alpha.get_lock():
+        if value > _alpha.value:
+            _alpha.value = value
+    return value, search.nodes
+
+
+class ParallelSearch():
+    """
+    Fixed-depth search of an m,n,k game, with the root moves spread over
+    `workers` processes. Use as a context manager, or call `close`.
+    """
+
+    def __init__(self, game, workers=None, depth=3):
+        self.game = game
+        self.depth = depth
+        self.workers = workers or os.cpu_count()
+        self.nodes = 0
+        self.alpha = multiprocessing.Value("d", -math.inf)
+        self.pool = None
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(
+                max_workers=self.workers,
+                initializer=_init_worker,
+                initargs=(self.alpha,)
+            )
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+    def start(self):
+        """
+        Starts the worker processes and waits until every one is ready,
+        which the pool would otherwise do during the first search.
+        """
+        if self.pool is not None:
+            for future in [self.pool.submit(os.getpid) for _ in range(self.workers)]:
+                future.result()
+
+    def close(self):
+        """
+        Shuts down the worker processes.
+        """
+        if self.pool is not None:
+            self.pool.shutdown()
+            self.pool = None
+
+    def minimax(self, board):
+        """
+        Returns the best action for the current player on the board.
+        """
+        game = self.game
+        if game.terminal(board):
+            return (None, None)
+
+        position = mnk.Position(game, board)
+        moves = mnk.Search(game, position, math.inf).ordered(position.candidates())
+        self.alpha.value = -math.inf
+        self.nodes = 0
+
+        # Search the eldest brother alone, then the rest together
+        _init_worker(self.alpha)
+        results = [_search_move(game, board, moves[0], self.depth)]
+        if self.pool is None:
+            results.extend(_search_move(game, board, cell, self.depth) for cell in moves[1:])
+        else:
+            futures = [
+                self.pool.submit(_search_move, game, board, cell, self.depth)
+                for cell in moves[1:]
+            ]
+            results.extend(future.result() for future in futures)
+
+        best, best_value = moves[0], -math.inf
+        for cell, (value, nodes) in zip(moves, results):
+            self.nodes += nodes
+            if value > best_value:
+                best, best_value = cell, value
+        return (best // game.cols, best % game.cols)
+
+
+def benchmark(rows, cols, k, depth, worker_counts, stones=4):
+    """
+    Times one search of a position with `stones` stones already played
+    for each worker count, and prints the speedup over one worker. The
+    pool is started before the clock, so only the search is timed.
+    """
+    game = mnk.Game(rows, cols, k, max_depth=depth)
+    board = game.initial_state()
+    with ParallelSearch(game, workers=1, depth=2) as opening:
+        for _ in range(stones):
+            board = game.result(board, opening.minimax(board))
+
+    print(f"{rows}x{cols}, {k} in a row, depth {depth}")
+    print(f"{'workers':>8} {'seconds':>9} {'speedup':>8} {'nodes':>10}  move")
+    baseline = None
+    for workers in worker_counts:
+        with ParallelSearch(game, workers=workers, depth=depth) as search:
+            search.start()
+            start = time.perf_counter()
+            move = search.minimax(board)
+            elapsed = time.perf_counter() - start
+        baseline = baseline or elapsed
+        print(f"{workers:>8} {elapsed:>9.3f} {baseline / elapsed:>8.2f} {search.nodes:>10}  {move}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Benchmark parallel root-split search.")
+    parser.add_argument("--rows", type=int, default=15)
+    parser.add_argument("--cols", type=int, default=15)
+    parser.add_argument("--k", type=int, default=5)
+    parser.add_argument("--depth", type=int, default=6)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    args = parser.parse_args()
+    benchmark(args.rows, args.cols, args.k, args.depth, args.workers)
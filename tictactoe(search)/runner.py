@@ -1,8 +1,22 @@
 import pygame
 import sys
-import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
-import tictactoe as ttt
+import mnk
+import tictactoe
+
+# Board size and how many in a row win; anything but 3x3 three-in-a-row
+# is played by the m,n,k engine under a per-move time budget
+ROWS = 3
+COLS = 3
+K = 3
+BUDGET = 1.0
+
+if (ROWS, COLS, K) == (3, 3, 3):
+    ttt = tictactoe
+else:
+    ttt = mnk.Game(ROWS, COLS, K, budget=BUDGET)
 
 pygame.init()
 size = width, height = 600, 400
@@ -15,132 +29,236 @@ screen = pygame.display.set_mode(size)
 
 mediumFont = pygame.font.Font("OpenSans-Regular.ttf", 28)
 largeFont = pygame.font.Font("OpenSans-Regular.ttf", 40)
-moveFont = pygame.font.Font("OpenSans-Regular.ttf", 60)
+
+# Fit the board between the title and the bottom button
+tile_size = min(80, int((height - 130) / max(ROWS, COLS)))
+moveFont = pygame.font.Font("OpenSans-Regular.ttf", int(tile_size * 0.75))
+tile_origin = (width / 2 - (COLS / 2 * tile_size),
+               height / 2 - (ROWS / 2 * tile_size))
+
+# Screen areas, redrawn only when what they show changes
+titleArea = pygame.Rect(0, 0, width, 60)
+playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
+playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
+againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
+tiles = [
+    [
+        pygame.Rect(
+            tile_origin[0] + j * tile_size,
+            tile_origin[1] + i * tile_size,
+            tile_size, tile_size
+        )
+        for j in range(COLS)
+    ]
+    for i in range(ROWS)
+]
+
+# Empty board, drawn once and copied to the screen as needed
+grid = pygame.Surface((COLS * tile_size, ROWS * tile_size))
+grid.fill(black)
+for i in range(ROWS):
+    for j in range(COLS):
+        rect = pygame.Rect(j * tile_size, i * tile_size, tile_size, tile_size)
+        pygame.draw.rect(grid, white, rect, 3 if tile_size > 30 else 1)
+
+# Rendered text, by font, text and color
+glyphs = {}
+
+
+def render(font, text, color):
+    """
+    Returns the surface for `text`, rendering it only the first time.
+    """
+    key = (font, text, color)
+    if key not in glyphs:
+        glyphs[key] = font.render(text, True, color)
+    return glyphs[key]
+
+
+def draw_text(font, text, color, center):
+    """
+    Draws `text` centered on `center` and returns the rect it covers.
+    """
+    surface = render(font, text, color)
+    rect = surface.get_rect()
+    rect.center = center
+    screen.blit(surface, rect)
+    return rect
+
+
+def draw_button(rect, label):
+    """
+    Draws a button and returns its rect.
+    """
+    pygame.draw.rect(screen, white, rect)
+    draw_text(mediumFont, label, black, rect.center)
+    return rect
+
+
+def draw_menu():
+    """
+    Draws the screen for choosing a player.
+    """
+    screen.fill(black)
+    draw_text(largeFont, "Play Tic-Tac-Toe", white, ((width / 2), 50))
+    draw_button(playXButton, "Play as X")
+    draw_button(playOButton, "Play as O")
+
+
+def draw_tile(i, j):
+    """
+    Draws tile (i, j) from the board and returns its rect.
+    """
+    rect = tiles[i][j]
+    area = rect.move(-tile_origin[0], -tile_origin[1])
+    screen.blit(grid, rect, area)
+    if board[i][j] != ttt.EMPTY:
+        draw_text(moveFont, board[i][j], white, rect.center)
+    return rect
+
+
+def status():
+    """
+    Returns the title for the game in progress.
+    """
+    if ttt.terminal(board):
+        winner = ttt.winner(board)
+        if winner is None:
+            return f"Game Over: Tie."
+        return f"Game Over: {winner} wins."
+    elif user == ttt.player(board):
+        return f"Play as {user}"
+    return f"Computer thinking..."
+
+
+def draw_status():
+    """
+    Draws the title and the Play Again button and returns their rects.
+    """
+    screen.fill(black, titleArea)
+    draw_text(largeFont, status(), white, ((width / 2), 30))
+    screen.fill(black, againButton)
+
+    # Offer a new game once this one is over, or to abandon a search
+    if ttt.terminal(board) or ai_move is not None:
+        draw_button(againButton, "Play Again")
+    return [titleArea, againButton]
+
+
+def draw_game():
+    """
+    Draws the whole game screen.
+    """
+    screen.fill(black)
+    screen.blit(grid, tile_origin)
+    for i in range(ROWS):
+        for j in range(COLS):
+            if board[i][j] != ttt.EMPTY:
+                draw_tile(i, j)
+    draw_status()
+
+
+# The AI thinks on a background thread and posts AI_DONE when its move
+# is ready, so the window keeps responding
+engine = ThreadPoolExecutor(max_workers=1)
+AI_DONE = pygame.USEREVENT
+
+
+def think(board, stop):
+    """
+    Returns the AI move for the board. Runs on the engine thread, and
+    gives up early on big boards once `stop` is set.
+    """
+    if ttt is tictactoe:
+        return ttt.minimax(board)
+    return ttt.minimax(board, stop=stop)
+
+
+def start_thinking():
+    """
+    Starts the AI search and returns its future.
+    """
+    future = engine.submit(think, board, stop)
+    future.add_done_callback(
+        lambda done: pygame.event.post(pygame.event.Event(AI_DONE, future=done))
+    )
+    return future
+
 
 user = None
 board = ttt.initial_state()
-ai_turn = False
+ai_move = None
+stop = threading.Event()
+
+draw_menu()
+pygame.display.flip()
 
 while True:
 
-    for event in pygame.event.get():
-        if event.type == pygame.QUIT:
-            sys.exit()
+    # Sleep until something happens
+    event = pygame.event.wait()
+    updates = []
 
-    screen.fill(black)
+    if event.type == pygame.QUIT:
+        stop.set()
+        sys.exit()
+
+    elif event.type == pygame.VIDEOEXPOSE:
+        if user is None:
+            draw_menu()
+        else:
+            draw_game()
+        updates.append(screen.get_rect())
 
-    # Let user choose a player.
-    if user is None:
-
-        # Draw title
-        title = largeFont.render("Play Tic-Tac-Toe", True, white)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 50)
-        screen.blit(title, titleRect)
-
-        # Draw buttons
-        playXButton = pygame.Rect((width / 8), (height / 2), width / 4, 50)
-        playX = mediumFont.render("Play as X", True, black)
-        playXRect = playX.get_rect()
-        playXRect.center = playXButton.center
-        pygame.draw.rect(screen, white, playXButton)
-        screen.blit(playX, playXRect)
-
-        playOButton = pygame.Rect(5 * (width / 8), (height / 2), width / 4, 50)
-        playO = mediumFont.render("Play as O", True, black)
-        playORect = playO.get_rect()
-        playORect.center = playOButton.center
-        pygame.draw.rect(screen, white, playOButton)
-        screen.blit(playO, playORect)
-
-        # Check if button is clicked
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1:
-            mouse = pygame.mouse.get_pos()
+    # Apply the AI move, unless the game it was for has been abandoned
+    elif event.type == AI_DONE:
+        if event.future is ai_move and not ai_move.cancelled():
+            i, j = ai_move.result()
+            ai_move = None
+            board = ttt.result(board, (i, j))
+            updates.append(draw_tile(i, j))
+            updates.extend(draw_status())
+
+    elif event.type == pygame.MOUSEBUTTONDOWN and event.button == 1:
+        mouse = event.pos
+
+        # Let user choose a player.
+        if user is None:
             if playXButton.collidepoint(mouse):
-                time.sleep(0.2)
                 user = ttt.X
             elif playOButton.collidepoint(mouse):
-                time.sleep(0.2)
                 user = ttt.O
+            if user is not None:
+                draw_game()
+                updates.append(screen.get_rect())
 
-    else:
-
-        # Draw game board
-        tile_size = 80
-        tile_origin = (width / 2 - (1.5 * tile_size),
-                       height / 2 - (1.5 * tile_size))
-        tiles = []
-        for i in range(3):
-            row = []
-            for j in range(3):
-                rect = pygame.Rect(
-                    tile_origin[0] + j * tile_size,
-                    tile_origin[1] + i * tile_size,
-                    tile_size, tile_size
-                )
-                pygame.draw.rect(screen, white, rect, 3)
-
-                if board[i][j] != ttt.EMPTY:
-                    move = moveFont.render(board[i][j], True, white)
-                    moveRect = move.get_rect()
-                    moveRect.center = rect.center
-                    screen.blit(move, moveRect)
-                row.append(rect)
-            tiles.append(row)
-
-        game_over = ttt.terminal(board)
-        player = ttt.player(board)
-
-        # Show title
-        if game_over:
-            winner = ttt.winner(board)
-            if winner is None:
-                title = f"Game Over: Tie."
-            else:
-                title = f"Game Over: {winner} wins."
-        elif user == player:
-            title = f"Play as {user}"
-        else:
-            title = f"Computer thinking..."
-        title = largeFont.render(title, True, white)
-        titleRect = title.get_rect()
-        titleRect.center = ((width / 2), 30)
-        screen.blit(title, titleRect)
-
-        # Check for AI move
-        if user != player and not game_over:
-            if ai_turn:
-                time.sleep(0.5)
-                move = ttt.minimax(board)
-                board = ttt.result(board, move)
-                ai_turn = False
-            else:
-                ai_turn = True
+        elif againButton.collidepoint(mouse) and (ttt.terminal(board) or ai_move is not None):
+            user = None
+            board = ttt.initial_state()
+
+            # Abandon any search still running
+            if ai_move is not None:
+                stop.set()
+                ai_move.cancel()
+                ai_move = None
+                stop = threading.Event()
+            draw_menu()
+            updates.append(screen.get_rect())
 
         # Check for a user move
-        click, _, _ = pygame.mouse.get_pressed()
-        if click == 1 and user == player and not game_over:
-            mouse = pygame.mouse.get_pos()
-            for i in range(3):
-                for j in range(3):
+        elif user == ttt.player(board) and not ttt.terminal(board):
+            for i in range(ROWS):
+                for j in range(COLS):
                     if (board[i][j] == ttt.EMPTY and tiles[i][j].collidepoint(mouse)):
                         board = ttt.result(board, (i, j))
+                        updates.append(draw_tile(i, j))
+                        updates.extend(draw_status())
+
+    # Check for AI move
+    if (user is not None and ai_move is None and not ttt.terminal(board)
+            and user != ttt.player(board)):
+        ai_move = start_thinking()
+        updates.extend(draw_status())
 
-        if game_over:
-            againButton = pygame.Rect(width / 3, height - 65, width / 3, 50)
-            again = mediumFont.render("Play Again", True, black)
-            againRect = again.get_rect()
-            againRect.center = againButton.center
-            pygame.draw.rect(screen, white, againButton)
-            screen.blit(again, againRect)
-            click, _, _ = pygame.mouse.get_pressed()
-            if click == 1:
-                mouse = pygame.mouse.get_pos()
-                if againButton.collidepoint(mouse):
-                    time.sleep(0.2)
-                    user = None
-                    board = ttt.initial_state()
-                    ai_turn = False
-
-    pygame.display.flip()
+    if updates:
+        pygame.display.update(updates)
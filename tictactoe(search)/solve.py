@@ -0,0 +1,87 @@
+"""
+Solves tic-tac-toe once and writes the perfect-play table used by
+tictactoe.minimax.
+
+Usage: python solve.py [output]
+"""
+
+import sys
+from array import array
+
+import bitboard as bb
+import tictactoe as ttt
+
+# Cell order for picking between equally good moves
+PREFERRED = [3 * i + j for i, j in ttt.PREFERRED]
+
+# Weight of each cell in the base-3 board code, matching tictactoe.encode
+WEIGHTS = [3 ** (8 - k) for k in range(9)]
+
+
+def solve():
+    """
+    Returns a dict mapping the bitboard of every reachable position to
+    its `(move, value)`, where `move` is the cell of the best move, or
+    NO_MOVE once the game is over, and `value` is the minimax value.
+    """
+
+    solved = dict()
+
+    def visit(x, o):
+        state = (x, o)
+        if state in solved:
+            return solved[state][1]
+        if bb.terminal(state):
+            solved[state] = (ttt.NO_MOVE, bb.utility(state))
+            return solved[state][1]
+
+        x_to_move = x.bit_count() == o.bit_count()
+        best, v = None, None
+        for k in PREFERRED:
+            bit = 1 << k
+            if (x | o) & bit:
+                continue
+            current = visit(x | bit, o) if x_to_move else visit(x, o | bit)
+            if v is None or (current > v if x_to_move else current < v):
+                best, v = k, current
+        solved[state] = (best, v)
+        return v
+
+    visit(0, 0)
+    return solved
+
+
+def table():
+    """
+    Returns the solution table as an array of bytes, in the format
+    described in tictactoe.py.
+    """
+
+    result = array("B", [ttt.UNREACHABLE]) * 3 ** 9
+    for (x, o), (move, value) in solve().items():
+        code = 0
+        for k in range(9):
+            if x >> k & 1:
+                code += WEIGHTS[k]
+            elif o >> k & 1:
+                code += 2 * WEIGHTS[k]
+        result[code] = (value + 1) << 4 | move
+    return result
+
+
+def build(path=ttt.SOLUTION):
+    """
+    Solves the game and writes the table to `path`.
+    Returns the number of positions written.
+    """
+
+    solved = table()
+    with open(path, "wb") as f:
+        solved.tofile(f)
+    return 3 ** 9 - solved.count(ttt.UNREACHABLE)
+
+
+if __name__ == "__main__":
+    path = sys.argv[1] if len(sys.argv) > 1 else ttt.SOLUTION
+    count = build(path)
+    print(f"Wrote {count} positions to {path}")
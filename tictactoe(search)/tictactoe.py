@@ -2,8 +2,14 @@
 Tic Tac Toe Player
 """
 
+import json
 import math
 import copy
+import mmap
+import os
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
 
 X = "X"
 O = "O"
@@ -119,53 +125,613 @@ def utility(board):
     else:
         return 0
 
-def minimax(board):
+def symmetries():
+    """
+    Returns the 8 rotations and reflections of the board, each as the
+    list of (i, j) cells read in row-major order.
+    """
+
+    result = []
+    for flip in (False, True):
+        for turns in range(4):
+            cells = []
+            for i in range(3):
+                for j in range(3):
+                    r, c = (i, 2 - j) if flip else (i, j)
+                    for _ in range(turns):
+                        r, c = c, 2 - r
+                    cells.append((r, c))
+            result.append(cells)
+    return result
+
+
+SYMMETRIES = symmetries()
+
+
+def encode(board, cells=SYMMETRIES[0]):
+    """
+    Returns the base-3 code of the board, reading `cells` in order with
+    the first cell as the most significant digit. Empty is 0, X is 1
+    and O is 2.
+    """
+
+    code = 0
+    for i, j in cells:
+        code = code * 3 + (1 if board[i][j] == X else 2 if board[i][j] == O else 0)
+    return code
+
+
+def canonical(board):
+    """
+    Returns a key for the board that is shared by all of its rotations
+    and reflections: the smallest base-3 code among the 8 symmetries.
+    """
+
+    return min(encode(board, cells) for cells in SYMMETRIES)
+
+
+# Perfect-play table built by solve.py: one byte per base-3 board code,
+# holding (value + 1) << 4 | move, where move is 3 * i + j, or NO_MOVE
+# once the game is over. Unreachable boards hold UNREACHABLE.
+SOLUTION = os.path.join(os.path.dirname(os.path.abspath(__file__)), "solution.bin")
+NO_MOVE = 9
+UNREACHABLE = 0xFF
+
+_solution = None
+
+
+def solution():
+    """
+    Returns the memory-mapped solution table, loading it on first use,
+    or None if it has not been built.
+    """
+
+    global _solution
+    if _solution is None:
+        try:
+            with open(SOLUTION, "rb") as f:
+                _solution = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except (OSError, ValueError):
+            _solution = False
+        if _solution and len(_solution) != 3 ** 9:
+            _solution.close()
+            _solution = False
+    return _solution or None
+
+
+def lookup(board):
+    """
+    Returns `(action, value)` for the board from the solution table,
+    where `value` is the minimax value, or None if the table is missing
+    or does not hold the board.
+    """
+
+    table = solution()
+    if table is None:
+        return None
+    entry = table[encode(board)]
+    if entry == UNREACHABLE:
+        return None
+    move = entry & 0xF
+    action = (None, None) if move == NO_MOVE else (move // 3, move % 3)
+    return action, (entry >> 4) - 1
+
+
+class TranspositionTable():
+    """
+    Cache of minimax values keyed by canonical position.
+
+    With `maxsize` set, the least recently used entry is evicted once
+    the table is full. `hits` and `misses` count lookups.
+    """
+
+    def __init__(self, maxsize=None):
+        self.maxsize = maxsize
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        """
+        Returns the value stored for `key`, or None if there is none.
+        """
+        if key in self.entries:
+            self.hits += 1
+            self.entries.move_to_end(key)
+            return self.entries[key]
+        self.misses += 1
+        return None
+
+    def put(self, key, value):
+        """
+        Stores `value` for `key`, evicting the oldest entry if needed.
+        """
+        self.entries[key] = value
+        self.entries.move_to_end(key)
+        if self.maxsize is not None and len(self.entries) > self.maxsize:
+            self.entries.popitem(last=False)
+
+    def clear(self):
+        """
+        Drops all entries and resets the counters.
+        """
+        self.entries.clear()
+        self.hits = 0
+        self.misses = 0
+
+
+# Shared by every search unless a table is passed in explicitly
+transpositions = TranspositionTable()
+
+
+# Rows, columns and diagonals through each cell, as flat cell indices
+LINES = [
+    (0, 1, 2), (3, 4, 5), (6, 7, 8),
+    (0, 3, 6), (1, 4, 7), (2, 5, 8),
+    (0, 4, 8), (2, 4, 6)
+]
+CELL_LINES = [[line for line in LINES if cell in line] for cell in range(9)]
+
+# Weight of each cell in the base-3 code of the board under each symmetry
+SYMMETRY_WEIGHTS = [
+    [3 ** (8 - cells.index((cell // 3, cell % 3))) for cell in range(9)]
+    for cells in SYMMETRIES
+]
+
+
+class GameState():
+    """
+    Mutable board for searching in place.
+
+    Moves are made with `make_move` and taken back with `undo_move`, and
+    the move count, the winner and the base-3 code of the board under
+    each symmetry are updated as they go, so `player`, `terminal`,
+    `utility` and `key` need no rescan of the board.
+
+    Cells are numbered 3 * i + j and hold 1 for X, -1 for O, 0 if empty.
+    """
+
+    def __init__(self, board=None):
+        self.cells = [0] * 9
+        self.count = 0
+
+        # 1 if X has won, -1 if O has, 0 otherwise
+        self.won = 0
+
+        # Code of the board under each of the 8 symmetries
+        self.codes = [0] * 8
+
+        # Cells played, in order, for undoing
+        self.history = [0] * 9
+
+        if board is not None:
+            x_moves = []
+            o_moves = []
+            for i in range(3):
+                for j in range(3):
+                    if board[i][j] == X:
+                        x_moves.append(3 * i + j)
+                    elif board[i][j] == O:
+                        o_moves.append(3 * i + j)
+            for n, cell in enumerate(x_moves):
+                self.make_move(cell)
+                if n < len(o_moves):
+                    self.make_move(o_moves[n])
+
+    def player(self):
+        """
+        Returns player who has the next turn.
+        """
+        return O if self.count & 1 else X
+
+    def terminal(self):
+        """
+        Returns True if game is over, False otherwise.
+        """
+        return self.won != 0 or self.count == 9
+
+    def utility(self):
+        """
+        Returns 1 if X has won the game, -1 if O has won, 0 otherwise.
+        """
+        return self.won
+
+    def key(self):
+        """
+        Returns the canonical code of the board, as `canonical` does.
+        """
+        return min(self.codes)
+
+    def make_move(self, cell):
+        """
+        Plays `cell` for the current player.
+        """
+        side = -1 if self.count & 1 else 1
+        digit = 1 if side == 1 else 2
+        cells = self.cells
+        cells[cell] = side
+        self.history[self.count] = cell
+        self.count += 1
+        codes = self.codes
+        for s in range(8):
+            codes[s] += digit * SYMMETRY_WEIGHTS[s][cell]
+        for a, b, c in CELL_LINES[cell]:
+            if cells[a] == cells[b] == cells[c]:
+                self.won = side
+
+    def undo_move(self):
+        """
+        Takes back the last move.
+        """
+        self.count -= 1
+        cell = self.history[self.count]
+        digit = 1 if self.cells[cell] == 1 else 2
+        self.cells[cell] = 0
+        codes = self.codes
+        for s in range(8):
+            codes[s] -= digit * SYMMETRY_WEIGHTS[s][cell]
+
+        # Play stops at a win, so no earlier position had a winner
+        self.won = 0
+
+    def board(self):
+        """
+        Returns the board in list form.
+        """
+        marks = {1: X, -1: O, 0: EMPTY}
+        return [[marks[self.cells[3 * i + j]] for j in range(3)] for i in range(3)]
+
+
+class SearchStats():
+    """
+    Record of the work done by each minimax call while collecting.
+
+    Each call adds a dict to `calls` with the method used, the nodes
+    visited, terminal positions reached, transposition table hits, the
+    deepest ply searched, the mean branching factor of expanded nodes
+    and the wall time in seconds. `callback`, if given, is called with
+    each record as its call returns.
+    """
+
+    def __init__(self, callback=None):
+        self.callback = callback
+        self.calls = []
+        self.current = None
+        self.root = 0
+        self.start = 0.0
+
+    def begin(self, method, board):
+        """
+        Starts the record for a minimax call on the board.
+        """
+        self.root = sum(cell != EMPTY for row in board for cell in row)
+        self.current = {
+            "method": method,
+            "nodes": 0,
+            "terminals": 0,
+            "cache_hits": 0,
+            "max_depth": 0,
+            "expanded": 0,
+            "children": 0
+        }
+        self.start = time.perf_counter()
+
+    def visit(self, state, hit=False):
+        """
+        Counts a visit to a GameState, answered from the cache if `hit`.
+        """
+        record = self.current
+        if record is None:
+            return
+        record["nodes"] += 1
+        depth = state.count - self.root
+        if depth > record["max_depth"]:
+            record["max_depth"] = depth
+        if hit:
+            record["cache_hits"] += 1
+        elif state.terminal():
+            record["terminals"] += 1
+        else:
+            record["expanded"] += 1
+            record["children"] += 9 - state.count
+
+    def end(self):
+        """
+        Finishes the record for the current call.
+        """
+        record = self.current
+        self.current = None
+        record["seconds"] = time.perf_counter() - self.start
+        expanded = record.pop("expanded")
+        children = record.pop("children")
+        record["branching"] = children / expanded if expanded else 0.0
+        self.calls.append(record)
+        if self.callback is not None:
+            self.callback(record)
+
+    def to_json(self, path=None):
+        """
+        Returns the records as JSON, also writing them to `path` if given.
+        """
+        text = json.dumps(self.calls, indent=2)
+        if path is not None:
+            with open(path, "w") as f:
+                f.write(text)
+        return text
+
+
+# Collector in use, if any; searches only check it against None
+_stats = None
+
+
+@contextmanager
+def collect(callback=None):
+    """
+    Collects SearchStats for every minimax call made inside the block.
+
+        with collect() as stats:
+            minimax(board)
+        print(stats.to_json())
+    """
+
+    global _stats
+    previous = _stats
+    _stats = SearchStats(callback)
+    try:
+        yield _stats
+    finally:
+        _stats = previous
+
+
+def minimax(board, table=None, search=None):
     """
     Returns the optimal action for the current player on the board.
+
+    If the solution table has been built, the move is looked up there.
+    Otherwise, or if `table` or `search` is given, it is searched for:
+    by `search`, e.g. an `AlphaBeta`, or by the memoized full search.
     """
 
+    if _stats is None:
+        return _minimax(board, table, search)
+
+    method = type(search).__name__ if search is not None else "minimax"
+    stats = _stats
+    stats.begin(method, board)
+    try:
+        return _minimax(board, table, search)
+    finally:
+        stats.end()
+
+
+def _minimax(board, table, search):
+    """
+    minimax without the stats bookkeeping, except that a call answered
+    from the solution table is recorded as a "lookup".
+    """
+
+    if search is not None:
+        return search.choose(board)
+    if table is None:
+        entry = lookup(board)
+        if entry is not None:
+            if _stats is not None:
+                _stats.current["method"] = "lookup"
+            return entry[0]
+        table = transpositions
+
+    state = GameState(board)
     best = (None, None)
-    if player(board) == X:
-        v = -math.inf
-        for action in actions(board):
-            currentV = minValue(result(board,action))
-            if currentV > v:
-                v = currentV
-                best = action
-    elif player(board) == O:
-        v = math.inf
-        for action in actions(board):
-            currentV = maxValue(result(board,action))
-            if currentV < v:
-                v = currentV
-                best = action
+    if state.terminal():
+        return best
+    maximizing = state.player() == X
+    v = -math.inf if maximizing else math.inf
+    for cell in range(9):
+        if state.cells[cell]:
+            continue
+        state.make_move(cell)
+        currentV = _min_value(state, table) if maximizing else _max_value(state, table)
+        state.undo_move()
+        if (currentV > v) if maximizing else (currentV < v):
+            v = currentV
+            best = (cell // 3, cell % 3)
     return best
 
 
-def maxValue(board):
+def maxValue(board, table=None):
     """
     Returns the max score that could achieve from the next move 
     """
 
-    if terminal(board):
-        return utility(board)
-    v = -math.inf
-    for action in actions(board):
-        v = max(v, minValue(result(board,action)))
-    return v
+    return _max_value(GameState(board), transpositions if table is None else table)
 
 
-def minValue(board):
+def minValue(board, table=None):
     """
     Returns the minimum score that could achieve from the next move 
     """
 
-    if terminal(board):
-        return utility(board)
-    v = math.inf
-    for action in actions(board):
-        v = min(v, maxValue(result(board,action)))
-    
+    return _min_value(GameState(board), transpositions if table is None else table)
+
+
+def _max_value(state, table):
+    """
+    maxValue on a GameState, searched in place.
+    """
+
+    key = state.key()
+    v = table.get(key)
+    if _stats is not None:
+        _stats.visit(state, v is not None)
+    if v is not None:
+        return v
+
+    if state.terminal():
+        v = state.utility()
+    else:
+        v = -math.inf
+        cells = state.cells
+        for cell in range(9):
+            if not cells[cell]:
+                state.make_move(cell)
+                v = max(v, _min_value(state, table))
+                state.undo_move()
+    table.put(key, v)
+    return v
+
+
+def _min_value(state, table):
+    """
+    minValue on a GameState, searched in place.
+    """
+
+    key = state.key()
+    v = table.get(key)
+    if _stats is not None:
+        _stats.visit(state, v is not None)
+    if v is not None:
+        return v
+
+    if state.terminal():
+        v = state.utility()
+    else:
+        v = math.inf
+        cells = state.cells
+        for cell in range(9):
+            if not cells[cell]:
+                state.make_move(cell)
+                v = min(v, _max_value(state, table))
+                state.undo_move()
+    table.put(key, v)
     return v
 
 
+CENTER = [(1, 1)]
+CORNERS = [(0, 0), (0, 2), (2, 0), (2, 2)]
+EDGES = [(0, 1), (1, 0), (1, 2), (2, 1)]
+PREFERRED = CENTER + CORNERS + EDGES
+PREFERRED_CELLS = tuple(3 * i + j for i, j in PREFERRED)
+
+
+def static_order(state):
+    """
+    Returns the cells center first, then corners, then edges.
+    """
+
+    return PREFERRED_CELLS
+
+
+class AlphaBeta():
+    """
+    Minimax search with alpha-beta pruning, run in place on a GameState.
+
+    `order` is called as `order(state)` and returns the cells in the
+    order to try them; cells already taken are skipped. With `killers`,
+    the killer moves at each depth (moves that caused a cutoff elsewhere
+    at the same depth) are tried before the rest. Scores never leave
+    [-1, 1], so the search starts with that window and stops looking at
+    a node as soon as a win for the side to move is found.
+
+    `nodes` counts positions visited and `cutoffs` counts cutoffs: the
+    nodes below the root whose remaining moves were pruned, once each
+    however many moves that skipped. The pruning factor shows in
+    `nodes` against the full search.
+    """
+
+    def __init__(self, order=static_order, killers=True):
+        self.order = order
+        self.nodes = 0
+        self.cutoffs = 0
+
+        # Cells that caused a cutoff, by number of moves played; they
+        # stay empty when killer moves are not used
+        self.use_killers = killers
+        self.killers = [[] for _ in range(10)]
+
+    def reset(self):
+        """
+        Clears the counters and the killer moves.
+        """
+        self.nodes = 0
+        self.cutoffs = 0
+        for killers in self.killers:
+            killers.clear()
+
+    def choose(self, board):
+        """
+        Returns the optimal action for the current player on the board.
+        """
+        state = GameState(board)
+        best = (None, None)
+        if state.terminal():
+            return best
+
+        maximizing = state.player() == X
+        alpha, beta = -1, 1
+        v = -math.inf if maximizing else math.inf
+        killers = self.killers[state.count]
+        order = self.order(state)
+        for group in (killers, order):
+            for cell in group:
+                if state.cells[cell] or (group is order and cell in killers):
+                    continue
+                state.make_move(cell)
+                currentV = self.search(state, alpha, beta)
+                state.undo_move()
+                if maximizing and currentV > v:
+                    v, best = currentV, (cell // 3, cell % 3)
+                    alpha = max(alpha, v)
+                elif not maximizing and currentV < v:
+                    v, best = currentV, (cell // 3, cell % 3)
+                    beta = min(beta, v)
+                if alpha >= beta:
+                    return best
+        return best
+
+    def value(self, board, alpha=-1, beta=1):
+        """
+        Returns the minimax value of the board, exact if it lies inside
+        (alpha, beta) and otherwise a bound on the far side of the window.
+        """
+        return self.search(GameState(board), alpha, beta)
+
+    def search(self, state, alpha, beta):
+        """
+        `value` on a GameState, searched in place.
+        """
+        self.nodes += 1
+        if _stats is not None:
+            _stats.visit(state)
+        if state.terminal():
+            return state.utility()
+
+        maximizing = not state.count & 1
+        killers = self.killers[state.count]
+        order = self.order(state)
+        cells = state.cells
+        v = -math.inf if maximizing else math.inf
+
+        # Killer moves first, then the rest in order without repeating them
+        for group in (killers, order):
+            for cell in group:
+                if cells[cell] or (group is order and cell in killers):
+                    continue
+                state.make_move(cell)
+                currentV = self.search(state, alpha, beta)
+                state.undo_move()
+                if maximizing:
+                    v = max(v, currentV)
+                    alpha = max(alpha, v)
+                else:
+                    v = min(v, currentV)
+                    beta = min(beta, v)
+                if alpha >= beta:
+                    self.cutoffs += 1
+                    if self.use_killers and cell not in killers:
+                        killers.insert(0, cell)
+                        del killers[2:]
+                    return v
+        return v
@@ -0,0 +1,194 @@
+"""
+Headless tic-tac-toe tournament
+
+Plays games between two agents without pygame or a display, spread
+over a process pool, and reports results and move latencies.
+
+Usage: python tournament.py FIRST SECOND [-n GAMES] [--workers W]
+                            [--seed S] [--playouts P] [--output FILE]
+
+Agents: random, minimax, alphabeta, table, mcts. FIRST plays X in even
+games and O in odd ones. Results are for FIRST, and games are seeded
+from --seed so runs can be repeated and diffed.
+"""
+
+import argparse
+import json
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import mcts
+import tictactoe as ttt
+
+
+def random_agent(rng, playouts):
+    """
+    Plays a uniformly random legal move.
+    """
+    return lambda board: rng.choice(sorted(ttt.actions(board)))
+
+
+def minimax_agent(rng, playouts):
+    """
+    Plays the memoized full minimax search.
+    """
+    table = ttt.TranspositionTable()
+    return lambda board: ttt.minimax(board, table=table)
+
+
+def alphabeta_agent(rng, playouts):
+    """
+    Plays alpha-beta search with killer move ordering.
+    """
+    search = ttt.AlphaBeta()
+    return lambda board: ttt.minimax(board, search=search)
+
+
+def table_agent(rng, playouts):
+    """
+    Plays moves looked up in the solution table.
+    """
+    if ttt.solution() is None:
+        raise RuntimeError("solution table missing; run solve.py first")
+    return ttt.minimax
+
+
+def mcts_agent(rng, playouts):
+    """
+    Plays Monte Carlo tree search with `playouts` playouts per move.
+    """
+    return mcts.MCTS(playouts=playouts, rng=rng).choose
+
+
+AGENTS = {
+    "random": random_agent,
+    "minimax": minimax_agent,
+    "alphabeta": alphabeta_agent,
+    "table": table_agent,
+    "mcts": mcts_agent
+}
+
+
+def play_game(first, second, seed, playouts):
+    """
+    Plays one game, with `first` as X when `seed` is even.
+    Returns the winning agent index (0, 1, or None for a tie) and the
+    move latencies in seconds for each agent.
+    """
+    rng = random.Random(seed)
+    agents = [AGENTS[first](rng, playouts), AGENTS[second](rng, playouts)]
+    marks = [ttt.X, ttt.O] if seed % 2 == 0 else [ttt.O, ttt.X]
+    latencies = [[], []]
+
+    board = ttt.initial_state()
+    while not ttt.terminal(board):
+        turn = marks.index(ttt.player(board))
+        start = time.perf_counter()
+        action = agents[turn](board)
+        latencies[turn].append(time.perf_counter() - start)
+        board = ttt.result(board, action)
+
+    winner = ttt.winner(board)
+    return (None if winner is None else marks.index(winner)), latencies
+
+
+def play_games(first, second, seeds, playouts):
+    """
+    Plays a game for each seed; run in a worker process.
+    """
+    return [play_game(first, second, seed, playouts) for seed in seeds]
+
+
+def percentiles(values, points=(50, 90, 99)):
+    """
+    Returns the nearest-rank percentiles of `values`, in milliseconds.
+    """
+    ordered = sorted(values)
+    if not ordered:
+        return {f"p{point}": None for point in points}
+    result = {}
+    for point in points:
+        rank = max(1, round(point / 100 * len(ordered)))
+        result[f"p{point}"] = 1000 * ordered[min(rank, len(ordered)) - 1]
+    return result
+
+
+def tournament(first, second, games, workers=None, seed=0, playouts=1000):
+    """
+    Plays `games` games between agents `first` and `second` and returns
+    a dict of the results.
+    """
+    workers = workers or os.cpu_count()
+    seeds = list(range(seed, seed + games))
+    batches = [seeds[i::workers] for i in range(workers) if seeds[i::workers]]
+
+    start = time.perf_counter()
+    if workers == 1:
+        outcomes = play_games(first, second, seeds, playouts)
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(play_games, first, second, batch, playouts) for batch in batches]
+            outcomes = [outcome for future in futures for outcome in future.result()]
+    elapsed = time.perf_counter() - start
+
+    wins = [0, 0]
+    draws = 0
+    latencies = [[], []]
+    for winner, times in outcomes:
+        if winner is None:
+            draws += 1
+        else:
+            wins[winner] += 1
+        latencies[0].extend(times[0])
+        latencies[1].extend(times[1])
+    moves = len(latencies[0]) + len(latencies[1])
+
+    return {
+        "first": first,
+        "second": second,
+        "games": games,
+        "seed": seed,
+        "playouts": playouts,
+        "workers": workers,
+        "wins": wins[0],
+        "draws": draws,
+        "losses": wins[1],
+        "moves": moves,
+        "seconds": elapsed,
+        "moves_per_second": moves / elapsed if elapsed else None,
+        "latency_ms": {
+            first if first != second else "first": percentiles(latencies[0]),
+            second if first != second else "second": percentiles(latencies[1])
+        }
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Play a headless tic-tac-toe tournament.")
+    parser.add_argument("first", choices=AGENTS)
+    parser.add_argument("second", choices=AGENTS)
+    parser.add_argument("-n", "--games", type=int, default=100)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--playouts", type=int, default=1000)
+    parser.add_argument("--output", help="write the results as JSON to this file")
+    args = parser.parse_args()
+
+    results = tournament(args.first, args.second, args.games,
+                         args.workers, args.seed, args.playouts)
+    print(f"{args.first} vs {args.second}: {results['wins']} won, "
+          f"{results['draws']} drawn, {results['losses']} lost "
+          f"({results['moves_per_second']:.0f} moves/s)")
+    for agent, points in results["latency_ms"].items():
+        print(f"  {agent}: " + ", ".join(
+            f"{name} {value:.3f} ms" for name, value in points.items() if value is not None
+        ))
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+
+if __name__ == "__main__":
+    main()